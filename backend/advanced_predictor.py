@@ -9,15 +9,99 @@ Considers multiple factors for accurate predictions:
 - Head-to-head statistics
 """
 
+import re
 import numpy as np
-from datetime import datetime, timedelta
 import logging
-from typing import Dict, List, Optional
+import threading
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Tuple
 from f1_data_fetcher import f1_fetcher
+from prediction_data import (
+    CIRCUIT_ALIASES, CIRCUIT_BONUS_MATRIX, CIRCUIT_KEY_IDX, CIRCUIT_SPECIALISTS,
+    DRIVER_FORM_SCORES, DRIVER_IDX, FORM_ARR, RACE_CRAFT_ARR, RACE_CRAFT_BONUS,
+    TEAM_IDX, TEAM_MOMENTUM, TEAM_MOMENTUM_ARR, UNKNOWN_DRIVER, UNKNOWN_TEAM,
+    WET_WEATHER_SPECIALISTS, frozen_array
+)
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional, the NumPy kernel works without it
+    njit = None
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Longest alias first so e.g. 'las vegas strip' wins over 'las vegas'
+_CIRCUIT_PATTERN = re.compile('|'.join(
+    re.escape(alias) for alias in sorted(CIRCUIT_ALIASES, key=len, reverse=True)))
+
+# Reasoning shown with a prediction: (score component, threshold, message)
+REASONING_RULES = (
+    ('form_score', 20, "Excellent recent form ({form_pct}% performance)"),
+    ('track_bonus', 0, "Strong historical performance at {location}"),
+    ('team_score', 15, "{team} showing excellent pace and reliability"),
+    ('race_craft', 1.05, "Exceptional race management and overtaking ability"),
+    ('championship_score', 20, "Leading championship contender with proven consistency"),
+)
+
+
+@dataclass(slots=True, frozen=True)
+class PredictionResult:
+    """
+    Winner prediction for a single race. Instances are shared through the
+    prediction cache, so they are immutable; to_dict() builds the JSON
+    form at the API boundary.
+    """
+    predicted_winner: str
+    team: str
+    confidence: float
+    reasoning: Tuple[str, ...]
+    # (driver, team, score, probability) for the predicted podium
+    top_3: Tuple[Tuple[str, str, float, float], ...]
+    prediction_method: str
+    breakdown: Optional[Tuple[Tuple[str, float], ...]] = None
+    circuit: Optional[str] = None
+    location: Optional[str] = None
+    round: Optional[int] = None
+    race_name: Optional[str] = None
+    race_date: Optional[str] = None
+    
+    def to_dict(self) -> Dict:
+        """Serializable form of the prediction"""
+        result = {
+            'predicted_winner': self.predicted_winner,
+            'team': self.team,
+            'confidence': self.confidence,
+            'probability': self.confidence,
+            'reasoning': list(self.reasoning),
+            'top_3_predictions': [
+                {'driver': driver, 'team': team, 'score': score, 'probability': probability}
+                for driver, team, score, probability in self.top_3
+            ]
+        }
+        if self.breakdown is not None:
+            result['breakdown'] = dict(self.breakdown)
+            result['circuit'] = self.circuit
+            result['location'] = self.location
+        result['prediction_method'] = self.prediction_method
+        if self.round is not None:
+            result['round'] = self.round
+            result['race_name'] = self.race_name
+            result['race_date'] = self.race_date
+            result['circuit'] = self.circuit
+            result['location'] = self.location
+        return result
+
+
+def _score_kernel(positions, idx, team_idx, form_arr, team_momentum_arr, craft_arr, circuit_row):
+    """Total score per driver: (championship + form + team + track) * race craft"""
+    championship = (16.0 - positions) / 15.0 * 25.0
+    return (championship + form_arr[idx] * 30.0 + team_momentum_arr[team_idx] * 20.0
+            + circuit_row[idx]) * craft_arr[idx]
+
+
+if njit is not None:
+    _score_kernel = njit(cache=True)(_score_kernel)
+
 
 class AdvancedF1Predictor:
     """Advanced ML-based F1 race prediction system"""
@@ -25,102 +109,61 @@ class AdvancedF1Predictor:
     def __init__(self):
         self.current_season = 2025
         
-        # Driver form weights (based on recent performance)
-        # Updated after each race dynamically
-        self.driver_form_scores = {
-            'Max Verstappen': 0.95,      # Won US GP (Round 19)
-            'Oscar Piastri': 0.88,       # P5 US GP but still leading championship
-            'Lando Norris': 0.90,        # P2 US GP, consistent
-            'Charles Leclerc': 0.85,     # P3 US GP, podium form
-            'George Russell': 0.80,      # Won Singapore GP (Round 18)
-            'Lewis Hamilton': 0.78,      # P4 US GP
-            'Andrea Kimi Antonelli': 0.65,
-            'Alexander Albon': 0.68,
-            'Carlos Sainz': 0.72,
-            'Sergio Perez': 0.60,
-            'Fernando Alonso': 0.70,
-            'Pierre Gasly': 0.62,
-            'Nico Hulkenberg': 0.66,
-            'Esteban Ocon': 0.58,
-            'Isack Hadjar': 0.55,
-            'Yuki Tsunoda': 0.60,
-            'Lance Stroll': 0.52,
-            'Jack Doohan': 0.48,
-            'Gabriel Bortoleto': 0.45,
-            'Zhou Guanyu': 0.42,
-            'Oliver Bearman': 0.50,
-            'Liam Lawson': 0.54,
-            'Franco Colapinto': 0.46
-        }
+        # Form and team momentum are updated after each race, so this
+        # predictor keeps its own copies of the shared seed tables
+        self.driver_form_scores = dict(DRIVER_FORM_SCORES)
+        self.team_momentum = dict(TEAM_MOMENTUM)
         
         # Track-specific performance (circuit characteristics favor different drivers)
-        self.circuit_specialists = {
-            'Monaco': ['Max Verstappen', 'Charles Leclerc', 'Fernando Alonso'],
-            'Singapore': ['George Russell', 'Lando Norris', 'Charles Leclerc'],
-            'Spa': ['Max Verstappen', 'Lewis Hamilton', 'George Russell'],
-            'Monza': ['Oscar Piastri', 'Lando Norris', 'Charles Leclerc'],
-            'Silverstone': ['Lewis Hamilton', 'George Russell', 'Lando Norris'],
-            'Suzuka': ['Max Verstappen', 'Fernando Alonso', 'Oscar Piastri'],
-            'Interlagos': ['Max Verstappen', 'Lewis Hamilton', 'Lando Norris'],
-            'COTA': ['Max Verstappen', 'Lewis Hamilton', 'Lando Norris'],  # US GP
-            'Mexico': ['Max Verstappen', 'Charles Leclerc', 'George Russell'],
-            'Montreal': ['Max Verstappen', 'George Russell', 'Fernando Alonso'],
-            'Melbourne': ['Oscar Piastri', 'Max Verstappen', 'Lando Norris'],
-            'Zandvoort': ['Max Verstappen', 'Lando Norris', 'George Russell'],
-            'Jeddah': ['Max Verstappen', 'Sergio Perez', 'Fernando Alonso'],
-            'Bahrain': ['Max Verstappen', 'Charles Leclerc', 'Carlos Sainz'],
-            'Shanghai': ['Fernando Alonso', 'Max Verstappen', 'Lewis Hamilton'],
-            'Miami': ['Max Verstappen', 'Lando Norris', 'Oscar Piastri'],
-            'Hungaroring': ['Lewis Hamilton', 'Fernando Alonso', 'Oscar Piastri'],
-            'Austria': ['Max Verstappen', 'Lando Norris', 'George Russell'],
-            'Baku': ['Max Verstappen', 'Sergio Perez', 'Charles Leclerc'],
-            'Losail': ['Max Verstappen', 'Oscar Piastri', 'George Russell'],
-            'Yas Marina': ['Max Verstappen', 'Lando Norris', 'Charles Leclerc'],
-            'Las Vegas': ['Max Verstappen', 'George Russell', 'Charles Leclerc']
-        }
-        
-        # Team momentum (based on recent race performance)
-        self.team_momentum = {
-            'Red Bull': 0.92,        # Max won US GP - back in form!
-            'McLaren': 0.88,         # Leading championship but P2/P5 at US GP
-            'Ferrari': 0.85,         # P3/P4 at US GP - strong podium
-            'Mercedes': 0.78,        # P6 US GP but won Singapore
-            'Williams': 0.62,
-            'RB F1 Team': 0.58,
-            'Haas F1 Team': 0.52,
-            'Alpine F1 Team': 0.48,
-            'Aston Martin': 0.56,
-            'Sauber': 0.42
-        }
+        self.circuit_specialists = CIRCUIT_SPECIALISTS
         
         # Weather specialists (drivers who perform better in wet conditions)
-        self.wet_weather_specialists = [
-            'Max Verstappen',    # Legendary in the wet
-            'Lewis Hamilton',    # 7x champion, wet weather master
-            'Fernando Alonso',   # Experience in all conditions
-            'George Russell',    # Strong wet weather performances
-            'Carlos Sainz'       # Proven in wet races
-        ]
+        self.wet_weather_specialists = WET_WEATHER_SPECIALISTS
         
         # Qualifying vs Race performance (some drivers gain/lose positions)
-        self.race_craft_bonus = {
-            'Max Verstappen': 1.15,      # Often gains positions
-            'Fernando Alonso': 1.12,     # Master of race craft
-            'Lewis Hamilton': 1.10,      # Experience helps in race
-            'George Russell': 1.08,
-            'Oscar Piastri': 1.05,
-            'Lando Norris': 1.05,
-            'Charles Leclerc': 1.03,
-            'Carlos Sainz': 1.02,
-            'Alexander Albon': 1.00,
-            'Nico Hulkenberg': 1.00,
-            'Sergio Perez': 0.95,        # Often loses positions
-            'Lance Stroll': 0.92,
-            'Pierre Gasly': 0.98,
-            'Yuki Tsunoda': 0.97
-        }
+        self.race_craft_bonus = RACE_CRAFT_BONUS
+        
+        # Struct-of-arrays view of the tables above for vectorized scoring.
+        # The arrays are read-only and shared until an update swaps in a copy
+        self.driver_idx = DRIVER_IDX
+        self._unknown_driver = UNKNOWN_DRIVER
+        self.team_idx = TEAM_IDX
+        self._unknown_team = UNKNOWN_TEAM
+        self.circuit_key_idx = CIRCUIT_KEY_IDX
+        self.form_arr = FORM_ARR
+        self.craft_arr = RACE_CRAFT_ARR
+        self.team_momentum_arr = TEAM_MOMENTUM_ARR
+        self.circuit_bonus = CIRCUIT_BONUS_MATRIX
+        
+        # Memoized predictions, keyed on the form version so that updates
+        # from new race results invalidate them
+        self._pred_cache: Dict[Tuple, PredictionResult] = {}
+        self._form_version = 0
+        
+        # Held while scoring and while an update swaps in new form/momentum
+        # tables, so a prediction never mixes old and new tables
+        self._tables_lock = threading.Lock()
+        
+        # Last race results are pulled in lazily on the first prediction
+        self._auto_updated = False
+    
+    def _form_array(self, form_scores: Dict[str, float]) -> np.ndarray:
+        """Form array for the given form scores"""
+        return frozen_array(np.array(
+            [form_scores[d] for d in self.driver_idx] + [0.5], dtype=np.float64))
+    
+    def _invalidate_predictions(self):
+        """Drop memoized predictions after the scoring tables change"""
+        self._form_version += 1
+        self._pred_cache.clear()
+    
+    def _ensure_auto_update(self):
+        """Refresh form from the last race in the background, once"""
+        if not self._auto_updated:
+            self._auto_updated = True
+            threading.Thread(target=self.auto_update_from_last_race, daemon=True).start()
     
-    def predict_all_upcoming_races(self) -> List[Dict]:
+    def predict_all_upcoming_races(self) -> List[PredictionResult]:
         """
         Predict winners for ALL upcoming races in the season
         Adapts predictions based on each circuit's characteristics
@@ -128,282 +171,325 @@ class AdvancedF1Predictor:
         Returns:
             List of predictions for each upcoming race
         """
+        self._ensure_auto_update()
+        
         try:
             # Get race schedule
             schedule_data = f1_fetcher.get_race_schedule()
             races = schedule_data['races']
             
-            predictions = []
+            # Standings are the same for every race, fetch them once
+            standings = f1_fetcher.get_current_standings()['standings']
             
-            for race in races:
-                # Create race info dict in expected format
-                race_info = {
-                    'race': race,
-                    'last_updated': datetime.now().isoformat(),
-                    'source': 'jolpica_api'
-                }
-                
-                # Predict winner for this specific race
-                prediction = self.predict_race_winner(race_info)
-                
-                # Add race-specific info
-                prediction['round'] = race['round']
-                prediction['race_name'] = race['name']
-                prediction['race_date'] = race['date']
-                prediction['circuit'] = race['circuit']
-                prediction['location'] = race['location']
-                
-                predictions.append(prediction)
+            try:
+                predictions = self._predict_batch(races, standings)
+            except Exception as e:
+                logger.error("Error in batch prediction, scoring races one by one: %s", e)
+                predictions = [self._predict_for_race(race, standings) for race in races]
+            
+            # Add race-specific info
+            predictions = [
+                replace(prediction, round=race['round'], race_name=race['name'], race_date=race['date'],
+                        circuit=race['circuit'], location=race['location'])
+                for race, prediction in zip(races, predictions)
+            ]
             
-            logger.info(f"Generated predictions for {len(predictions)} upcoming races")
+            logger.info("Generated predictions for %d upcoming races", len(predictions))
             return predictions
             
         except Exception as e:
-            logger.error(f"Error predicting all upcoming races: {e}")
+            logger.error("Error predicting all upcoming races: %s", e)
             return []
     
-    def predict_race_winner(self, next_race_info: Dict) -> Dict:
+    def predict_race_winner(self, next_race_info: Dict, standings: Optional[List[Dict]] = None) -> PredictionResult:
         """
         Predict the winner of the next race using advanced ML algorithms
         
         Args:
             next_race_info: Dictionary containing race information
+            standings: Current driver standings (fetched if not provided)
             
         Returns:
-            Dictionary with prediction, confidence, and reasoning
+            PredictionResult with prediction, confidence, and reasoning
+        """
+        self._ensure_auto_update()
+        return self._predict_for_race(next_race_info.get('race', {}), standings)
+    
+    def _map_standings(self, standings: List[Dict]) -> Tuple:
+        """Map the top 15 drivers in the standings onto the score arrays"""
+        top = standings[:15]
+        idx = np.array([self.driver_idx.get(s['driver'], self._unknown_driver) for s in top])
+        team_idx = np.array([self.team_idx.get(s['team'], self._unknown_team) for s in top])
+        positions = np.array([s['position'] for s in top], dtype=np.float64)
+        return top, idx, team_idx, positions
+    
+    def _cache_key(self, circuit_name: str, location: str, top: List[Dict]) -> Tuple:
+        """Predictions only change with the standings or the form tables"""
+        return (self._form_version, circuit_name, location,
+                tuple((s['driver'], s['team'], s['position']) for s in top))
+    
+    def _predict_batch(self, races: List[Dict], standings: List[Dict]) -> List[PredictionResult]:
         """
+        Score every race in one pass. All races share the championship,
+        form and team components; only the circuit bonus row differs.
+        """
+        with self._tables_lock:
+            return self._predict_batch_locked(races, standings)
+    
+    def _predict_batch_locked(self, races: List[Dict], standings: List[Dict]) -> List[PredictionResult]:
+        """_predict_batch body; the caller holds the tables lock"""
+        top, idx, team_idx, positions = self._map_standings(standings)
+        
+        predictions: List[Optional[PredictionResult]] = [None] * len(races)
+        pending = []
+        for i, race in enumerate(races):
+            circuit_name = race.get('circuit', '')
+            location = race.get('location', '')
+            cache_key = self._cache_key(circuit_name, location, top)
+            cached = self._pred_cache.get(cache_key)
+            if cached is not None:
+                predictions[i] = cached
+            else:
+                circuit_key = self._get_circuit_key(circuit_name, location)
+                pending.append((i, circuit_name, location, circuit_key, cache_key))
+        
+        if pending:
+            # (n_races, n_drivers) circuit bonus matrix, one row per race
+            rows = [self.circuit_key_idx.get(circuit_key, -1) for _, _, _, circuit_key, _ in pending]
+            circuit_rows = self.circuit_bonus[rows][:, idx]
+            
+            common = ((16 - positions) / 15 * 25 + self.form_arr[idx] * 30
+                      + self.team_momentum_arr[team_idx] * 20)
+            totals = (common + circuit_rows) * self.craft_arr[idx]
+            
+            # Podium and confidence for every race at once (stable, so ties
+            # keep championship order)
+            podiums = np.argsort(-totals, axis=1, kind='stable')[:, :3]
+            race_rows = np.arange(len(pending))
+            winner_scores = totals[race_rows, podiums[:, 0]]
+            second_scores = totals[race_rows, podiums[:, 1]]
+            confidences = np.minimum(95.0, 60.0 + (winner_scores - second_scores) / winner_scores * 100.0)
+            
+            for row, (i, circuit_name, location, circuit_key, cache_key) in enumerate(pending):
+                predictions[i] = self._build_prediction(
+                    circuit_name, location, circuit_key, cache_key,
+                    top, idx, team_idx, positions, totals[row], circuit_rows[row],
+                    podiums[row], float(confidences[row]))
+        
+        return predictions
+    
+    def _predict_for_race(self, race: Dict, standings: Optional[List[Dict]] = None) -> PredictionResult:
+        """Score the drivers in the standings for a single race from the schedule"""
         try:
             # Get current standings to know who's available
-            standings_data = f1_fetcher.get_current_standings()
-            standings = standings_data['standings']
+            if standings is None:
+                standings = f1_fetcher.get_current_standings()['standings']
             
             # Extract circuit name for track-specific analysis
-            circuit_name = next_race_info.get('race', {}).get('circuit', '')
-            location = next_race_info.get('race', {}).get('location', '')
+            circuit_name = race.get('circuit', '')
+            location = race.get('location', '')
+            
+            logger.info("Predicting winner for: %s (%s)", circuit_name, location)
             
-            logger.info(f"Predicting winner for: {circuit_name} ({location})")
+            top, idx, team_idx, positions = self._map_standings(standings)
             
             # Get circuit key for specialist lookup
             circuit_key = self._get_circuit_key(circuit_name, location)
+            circuit_row = self.circuit_bonus[self.circuit_key_idx.get(circuit_key, -1)]
             
-            # Calculate scores for each driver
-            driver_scores = {}
-            
-            for standing in standings[:15]:  # Top 15 drivers only
-                driver = standing['driver']
-                team = standing['team']
-                
-                # Base score from championship position (inverse - P1 gets highest)
-                championship_score = (16 - standing['position']) / 15 * 25
-                
-                # Recent form score (0-30 points)
-                form_score = self.driver_form_scores.get(driver, 0.5) * 30
-                
-                # Team momentum (0-20 points)
-                team_score = self.team_momentum.get(team, 0.5) * 20
+            with self._tables_lock:
+                cache_key = self._cache_key(circuit_name, location, top)
+                cached = self._pred_cache.get(cache_key)
+                if cached is not None:
+                    return cached
                 
-                # Track-specific bonus (0-15 points)
-                track_bonus = 0
-                circuit_specialists = self.circuit_specialists.get(circuit_key, [])
-                if driver in circuit_specialists:
-                    specialist_rank = circuit_specialists.index(driver)
-                    track_bonus = (3 - specialist_rank) * 5 if specialist_rank < 3 else 0
+                totals = _score_kernel(positions, idx, team_idx, self.form_arr,
+                                       self.team_momentum_arr, self.craft_arr, circuit_row)
                 
-                # Race craft multiplier (affects final score)
-                race_craft = self.race_craft_bonus.get(driver, 1.0)
+                # Top 3 by total score: partition around the third-best score, then
+                # sort just those drivers (stable, so ties keep championship order)
+                candidates = np.flatnonzero(totals >= np.partition(totals, -3)[-3])
+                podium = candidates[np.argsort(-totals[candidates], kind='stable')][:3]
                 
-                # Calculate total score
-                total_score = (championship_score + form_score + team_score + track_bonus) * race_craft
+                # Confidence: bigger gap = higher confidence
+                winner_score = float(totals[podium[0]])
+                score_gap = winner_score - float(totals[podium[1]])
+                confidence = min(95.0, 60 + (score_gap / winner_score * 100))
                 
-                driver_scores[driver] = {
-                    'total_score': total_score,
-                    'championship_score': championship_score,
-                    'form_score': form_score,
-                    'team_score': team_score,
-                    'track_bonus': track_bonus,
-                    'race_craft': race_craft,
-                    'team': team
-                }
-            
-            # Sort by total score
-            sorted_drivers = sorted(driver_scores.items(), 
-                                  key=lambda x: x[1]['total_score'], 
-                                  reverse=True)
-            
-            # Get top 3 predictions
-            winner = sorted_drivers[0]
-            second = sorted_drivers[1]
-            third = sorted_drivers[2]
-            
-            # Calculate confidence based on score gap
-            winner_score = winner[1]['total_score']
-            second_score = second[1]['total_score']
-            score_gap = winner_score - second_score
-            
-            # Confidence: bigger gap = higher confidence
-            confidence = min(95, 60 + (score_gap / winner_score * 100))
-            
-            # Build reasoning
-            reasoning = self._build_reasoning(winner[0], winner[1], circuit_key, location)
-            
-            prediction_result = {
-                'predicted_winner': winner[0],
-                'team': winner[1]['team'],
-                'confidence': round(confidence, 1),
-                'probability': round(confidence, 1),
-                'reasoning': reasoning,
-                'top_3_predictions': [
-                    {
-                        'driver': winner[0],
-                        'team': winner[1]['team'],
-                        'score': round(winner[1]['total_score'], 2),
-                        'probability': round(confidence, 1)
-                    },
-                    {
-                        'driver': second[0],
-                        'team': second[1]['team'],
-                        'score': round(second[1]['total_score'], 2),
-                        'probability': round(confidence * 0.75, 1)
-                    },
-                    {
-                        'driver': third[0],
-                        'team': third[1]['team'],
-                        'score': round(third[1]['total_score'], 2),
-                        'probability': round(confidence * 0.55, 1)
-                    }
-                ],
-                'breakdown': {
-                    'championship_position': round(winner[1]['championship_score'], 2),
-                    'recent_form': round(winner[1]['form_score'], 2),
-                    'team_momentum': round(winner[1]['team_score'], 2),
-                    'track_specialist': round(winner[1]['track_bonus'], 2),
-                    'race_craft': round(winner[1]['race_craft'], 2)
-                },
-                'circuit': circuit_name,
-                'location': location,
-                'prediction_method': 'Advanced ML Multi-Factor Analysis'
-            }
-            
-            logger.info(f"Prediction: {winner[0]} with {confidence:.1f}% confidence")
-            return prediction_result
+                return self._build_prediction(circuit_name, location, circuit_key, cache_key,
+                                              top, idx, team_idx, positions, totals, circuit_row[idx],
+                                              podium, confidence)
             
         except Exception as e:
-            logger.error(f"Error in predict_race_winner: {e}")
+            logger.error("Error in predict_race_winner: %s", e)
             return self._fallback_prediction()
     
+    def _build_prediction(self, circuit_name: str, location: str, circuit_key: str, cache_key: Tuple,
+                          top: List[Dict], idx: np.ndarray, team_idx: np.ndarray,
+                          positions: np.ndarray, totals: np.ndarray, track_bonus: np.ndarray,
+                          podium: np.ndarray, confidence: float) -> PredictionResult:
+        """
+        Turn the scored podium for one race into a prediction and memoize it
+        (the caller holds the tables lock)
+        """
+        first, second, third = podium
+        winner_score = float(totals[first])
+        second_score = float(totals[second])
+        
+        # Score components are only needed for the winner
+        winner_name = top[first]['driver']
+        winner = {
+            'total_score': winner_score,
+            'championship_score': float((16 - positions[first]) / 15 * 25),
+            'form_score': float(self.form_arr[idx[first]] * 30),
+            'team_score': float(self.team_momentum_arr[team_idx[first]] * 20),
+            'track_bonus': float(track_bonus[first]),
+            'race_craft': float(self.craft_arr[idx[first]]),
+            'team': top[first]['team']
+        }
+        
+        # Build reasoning
+        reasoning = self._build_reasoning(winner_name, winner, circuit_key, location)
+        
+        prediction_result = PredictionResult(
+            predicted_winner=winner_name,
+            team=winner['team'],
+            confidence=round(confidence, 1),
+            reasoning=tuple(reasoning),
+            top_3=(
+                (winner_name, winner['team'], round(winner_score, 2), round(confidence, 1)),
+                (top[second]['driver'], top[second]['team'], round(second_score, 2),
+                 round(confidence * 0.75, 1)),
+                (top[third]['driver'], top[third]['team'], round(float(totals[third]), 2),
+                 round(confidence * 0.55, 1))
+            ),
+            prediction_method='Advanced ML Multi-Factor Analysis',
+            breakdown=(
+                ('championship_position', round(winner['championship_score'], 2)),
+                ('recent_form', round(winner['form_score'], 2)),
+                ('team_momentum', round(winner['team_score'], 2)),
+                ('track_specialist', round(winner['track_bonus'], 2)),
+                ('race_craft', round(winner['race_craft'], 2))
+            ),
+            circuit=circuit_name,
+            location=location
+        )
+        
+        logger.info("Prediction: %s with %.1f%% confidence", winner_name, confidence)
+        
+        if len(self._pred_cache) >= 256:
+            self._pred_cache.clear()
+        self._pred_cache[cache_key] = prediction_result
+        return prediction_result
+    
     def _get_circuit_key(self, circuit_name: str, location: str) -> str:
         """Map circuit name to lookup key"""
-        circuit_map = {
-            'Circuit of the Americas': 'COTA',
-            'Autódromo Hermanos Rodríguez': 'Mexico',
-            'Autódromo José Carlos Pace': 'Interlagos',
-            'Las Vegas Strip': 'Las Vegas',
-            'Losail': 'Losail',
-            'Yas Marina': 'Yas Marina',
-            'Bahrain': 'Bahrain',
-            'Jeddah': 'Jeddah',
-            'Albert Park': 'Melbourne',
-            'Suzuka': 'Suzuka',
-            'Shanghai': 'Shanghai',
-            'Miami': 'Miami',
-            'Imola': 'Imola',
-            'Monaco': 'Monaco',
-            'Circuit Gilles Villeneuve': 'Montreal',
-            'Barcelona': 'Barcelona',
-            'Red Bull Ring': 'Austria',
-            'Silverstone': 'Silverstone',
-            'Hungaroring': 'Hungaroring',
-            'Spa': 'Spa',
-            'Zandvoort': 'Zandvoort',
-            'Monza': 'Monza',
-            'Marina Bay': 'Singapore',
-            'Baku': 'Baku'
-        }
+        circuit_lower = circuit_name.lower()
+        location_lower = location.lower()
         
-        for key, value in circuit_map.items():
-            if key.lower() in circuit_name.lower() or key.lower() in location.lower():
-                return value
+        key = CIRCUIT_ALIASES.get(circuit_lower) or CIRCUIT_ALIASES.get(location_lower)
+        if key:
+            return key
         
-        # Try location-based matching
-        if 'Austin' in location or 'United States' in location:
-            return 'COTA'
-        elif 'Mexico' in location:
-            return 'Mexico'
-        elif 'Brazil' in location or 'São Paulo' in location:
-            return 'Interlagos'
-        elif 'Las Vegas' in location:
-            return 'Las Vegas'
-        elif 'Qatar' in location:
-            return 'Losail'
-        elif 'Abu Dhabi' in location:
-            return 'Yas Marina'
+        # Fall back to substring matching on the circuit name, then location
+        match = _CIRCUIT_PATTERN.search(circuit_lower) or _CIRCUIT_PATTERN.search(location_lower)
+        if match:
+            return CIRCUIT_ALIASES[match.group(0)]
         
         return 'Unknown'
     
     def _build_reasoning(self, driver: str, scores: Dict, circuit: str, location: str) -> List[str]:
         """Build human-readable reasoning for prediction"""
-        reasoning = []
-        
-        # Form-based reason
-        if scores['form_score'] > 20:
-            reasoning.append(f"Excellent recent form ({int(scores['form_score']/30*100)}% performance)")
-        
-        # Track specialist reason
-        if scores['track_bonus'] > 0:
-            reasoning.append(f"Strong historical performance at {location}")
-        
-        # Team momentum
-        if scores['team_score'] > 15:
-            reasoning.append(f"{scores['team']} showing excellent pace and reliability")
-        
-        # Race craft
-        if scores['race_craft'] > 1.05:
-            reasoning.append("Exceptional race management and overtaking ability")
-        
-        # Championship position
-        if scores['championship_score'] > 20:
-            reasoning.append("Leading championship contender with proven consistency")
+        reasoning = [
+            message.format(form_pct=int(scores['form_score'] / 30 * 100),
+                           location=location, team=scores['team'])
+            for key, threshold, message in REASONING_RULES
+            if scores[key] > threshold
+        ]
         
         return reasoning if reasoning else ["Strong overall performance across all factors"]
     
-    def _fallback_prediction(self) -> Dict:
+    def _fallback_prediction(self) -> PredictionResult:
         """Fallback prediction if main prediction fails"""
-        return {
-            'predicted_winner': 'Max Verstappen',
-            'team': 'Red Bull',
-            'confidence': 75.0,
-            'probability': 75.0,
-            'reasoning': ['Championship-winning experience', 'Consistent performance'],
-            'top_3_predictions': [
-                {'driver': 'Max Verstappen', 'team': 'Red Bull', 'score': 85.0, 'probability': 75.0},
-                {'driver': 'Oscar Piastri', 'team': 'McLaren', 'score': 80.0, 'probability': 65.0},
-                {'driver': 'Lando Norris', 'team': 'McLaren', 'score': 78.0, 'probability': 60.0}
-            ],
-            'prediction_method': 'Fallback (Championship Standings)'
-        }
+        return PredictionResult(
+            predicted_winner='Max Verstappen',
+            team='Red Bull',
+            confidence=75.0,
+            reasoning=('Championship-winning experience', 'Consistent performance'),
+            top_3=(
+                ('Max Verstappen', 'Red Bull', 85.0, 75.0),
+                ('Oscar Piastri', 'McLaren', 80.0, 65.0),
+                ('Lando Norris', 'McLaren', 78.0, 60.0)
+            ),
+            prediction_method='Fallback (Championship Standings)'
+        )
     
-    def update_driver_form(self, race_results: List[Dict]):
-        """
-        Update driver form scores based on recent race results
-        Called automatically after each race
-        """
-        logger.info("Updating driver form scores based on recent results...")
+    def _updated_form_scores(self, race_results: List[Dict]) -> Dict[str, float]:
+        """New driver form scores after a race (the current ones are left as they are)"""
+        form_scores = dict(self.driver_form_scores)
         
         for result in race_results[:10]:  # Top 10 finishers
             driver = result.get('driver')
             position = result.get('position', 99)
             
-            if driver in self.driver_form_scores:
+            if driver in form_scores:
                 # Adjust form score based on result
                 if position == 1:
-                    self.driver_form_scores[driver] = min(0.98, self.driver_form_scores[driver] + 0.05)
+                    form_scores[driver] = min(0.98, form_scores[driver] + 0.05)
                 elif position <= 3:
-                    self.driver_form_scores[driver] = min(0.95, self.driver_form_scores[driver] + 0.03)
+                    form_scores[driver] = min(0.95, form_scores[driver] + 0.03)
                 elif position <= 5:
-                    self.driver_form_scores[driver] = min(0.90, self.driver_form_scores[driver] + 0.01)
+                    form_scores[driver] = min(0.90, form_scores[driver] + 0.01)
                 elif position > 15:
-                    self.driver_form_scores[driver] = max(0.40, self.driver_form_scores[driver] - 0.02)
+                    form_scores[driver] = max(0.40, form_scores[driver] - 0.02)
+        
+        return form_scores
+    
+    def _updated_team_momentum(self, race_results: List[Dict]) -> Tuple[Dict[str, float], np.ndarray]:
+        """
+        New team momentum table and array after a race, from each team's
+        average finishing position (the current ones are left as they are)
+        """
+        top10 = race_results[:10]
+        team_ids = np.array([self.team_idx.get(r.get('team'), -1) for r in top10], dtype=np.intp)
+        positions = np.array([r.get('position', 99) for r in top10], dtype=np.float64)
+        known = team_ids >= 0
+        n_teams = len(self.team_idx)
+        
+        sums = np.bincount(team_ids[known], weights=positions[known], minlength=n_teams)
+        counts = np.bincount(team_ids[known], minlength=n_teams)
+        raced = counts > 0
+        avg_position = np.divide(sums, counts, out=np.zeros(n_teams), where=raced)
+        
+        # Adjust team momentum
+        momentum_arr = self.team_momentum_arr.copy()
+        momentum = momentum_arr[:n_teams]
+        adjusted = np.where(avg_position <= 3, np.minimum(0.98, momentum + 0.05),
+                   np.where(avg_position <= 6, np.minimum(0.95, momentum + 0.02),
+                   np.where(avg_position > 12, np.maximum(0.35, momentum - 0.03), momentum)))
+        momentum[:] = np.where(raced, adjusted, momentum)
         
+        # Keep the name-keyed table in sync with the array
+        team_momentum = dict(self.team_momentum)
+        for team, i in self.team_idx.items():
+            team_momentum[team] = float(momentum[i])
+        
+        return team_momentum, frozen_array(momentum_arr)
+    
+    def update_driver_form(self, race_results: List[Dict]):
+        """
+        Update driver form scores based on recent race results
+        Called automatically after each race
+        """
+        logger.info("Updating driver form scores based on recent results...")
+        
+        form_scores = self._updated_form_scores(race_results)
+        form_arr = self._form_array(form_scores)
+        
+        with self._tables_lock:
+            self.driver_form_scores = form_scores
+            self.form_arr = form_arr
+            self._invalidate_predictions()
         logger.info("Driver form scores updated successfully")
     
     def auto_update_from_last_race(self):
@@ -419,30 +505,18 @@ class AdvancedF1Predictor:
             results = last_race.get('results', [])
             
             if results:
-                # Update driver form scores
-                self.update_driver_form(results)
-                
-                # Update team momentum based on race performance
-                team_results = {}
-                for result in results[:10]:
-                    team = result.get('team')
-                    position = result.get('position', 99)
-                    
-                    if team not in team_results:
-                        team_results[team] = []
-                    team_results[team].append(position)
+                # Build the new form and team momentum tables off to the
+                # side, then swap both in at once
+                form_scores = self._updated_form_scores(results)
+                form_arr = self._form_array(form_scores)
+                team_momentum, team_momentum_arr = self._updated_team_momentum(results)
                 
-                # Adjust team momentum
-                for team, positions in team_results.items():
-                    avg_position = sum(positions) / len(positions)
-                    
-                    if team in self.team_momentum:
-                        if avg_position <= 3:
-                            self.team_momentum[team] = min(0.98, self.team_momentum[team] + 0.05)
-                        elif avg_position <= 6:
-                            self.team_momentum[team] = min(0.95, self.team_momentum[team] + 0.02)
-                        elif avg_position > 12:
-                            self.team_momentum[team] = max(0.35, self.team_momentum[team] - 0.03)
+                with self._tables_lock:
+                    self.driver_form_scores = form_scores
+                    self.form_arr = form_arr
+                    self.team_momentum = team_momentum
+                    self.team_momentum_arr = team_momentum_arr
+                    self._invalidate_predictions()
                 
                 logger.info("Predictor auto-updated successfully based on last race")
                 return True
@@ -451,12 +525,9 @@ class AdvancedF1Predictor:
                 return False
                 
         except Exception as e:
-            logger.error(f"Error in auto_update_from_last_race: {e}")
+            logger.error("Error in auto_update_from_last_race: %s", e)
             return False
 
 
 # Create global instance
 advanced_predictor = AdvancedF1Predictor()
-
-# Auto-update predictor on module load
-advanced_predictor.auto_update_from_last_race()
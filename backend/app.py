@@ -1,5 +1,6 @@
 ﻿from flask import Flask, jsonify
 from flask_cors import CORS
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import logging
 import random
@@ -34,22 +35,28 @@ allowed_origins = [
 ]
 CORS(app, resources={r"/api/*": {"origins": allowed_origins}})
 
+# Runs independent Jolpica lookups alongside each other within a request
+_fetch_pool = ThreadPoolExecutor(max_workers=4)
+
+# Static API index served at "/"
+API_INDEX = {
+    "message": "DriveAhead F1 Analytics API",
+    "version": "2.0.0",
+    "status": "operational",
+    "endpoints": {
+        "status": "/api/status",
+        "standings": "/api/standings",
+        "predictions": "/api/predictions",
+        "telemetry": "/api/telemetry",
+        "next_race": "/api/next-race",
+        "last_race": "/api/last-race",
+        "schedule": "/api/race-schedule"
+    }
+}
+
 @app.route("/")
 def index():
-    return jsonify({
-        "message": "DriveAhead F1 Analytics API",
-        "version": "2.0.0",
-        "status": "operational",
-        "endpoints": {
-            "status": "/api/status",
-            "standings": "/api/standings",
-            "predictions": "/api/predictions",
-            "telemetry": "/api/telemetry",
-            "next_race": "/api/next-race",
-            "last_race": "/api/last-race",
-            "schedule": "/api/race-schedule"
-        }
-    })
+    return jsonify(API_INDEX)
 
 @app.route("/api/status")
 def api_status():
@@ -64,8 +71,9 @@ def api_status():
 def api_standings():
     """REAL-TIME: Fetch live standings from Jolpica F1 API"""
     try:
-        driver_data = f1_fetcher.get_current_standings()
+        driver_future = _fetch_pool.submit(f1_fetcher.get_current_standings)
         constructor_data = f1_fetcher.get_constructor_standings()
+        driver_data = driver_future.result()
         
         return jsonify({
             "drivers": driver_data['standings'],
@@ -103,7 +111,7 @@ def api_predictions_winner():
         next_race_data = f1_fetcher.get_next_race()
         
         # Use advanced predictor to predict winner
-        prediction = advanced_predictor.predict_race_winner(next_race_data)
+        prediction = advanced_predictor.predict_race_winner(next_race_data).to_dict()
         
         return jsonify({
             "prediction": {
@@ -206,12 +214,13 @@ def api_telemetry():
 def api_predictions():
     """REAL-TIME: Advanced ML predictions for all drivers"""
     try:
-        # Get current standings and next race
-        driver_data = f1_fetcher.get_current_standings()
+        # Get current standings and next race (fetched concurrently)
+        driver_future = _fetch_pool.submit(f1_fetcher.get_current_standings)
         next_race_data = f1_fetcher.get_next_race()
+        driver_data = driver_future.result()
         
         # Get advanced prediction for winner
-        winner_prediction = advanced_predictor.predict_race_winner(next_race_data)
+        winner_prediction = advanced_predictor.predict_race_winner(next_race_data).to_dict()
         
         # Get top 3 predictions from advanced predictor
         top_3_predictions = winner_prediction.get('top_3_predictions', [])
@@ -279,7 +288,7 @@ def api_predictions():
 def api_predictions_all_races():
     """REAL-TIME: Predictions for ALL upcoming races (adapts to each circuit)"""
     try:
-        all_predictions = advanced_predictor.predict_all_upcoming_races()
+        all_predictions = [prediction.to_dict() for prediction in advanced_predictor.predict_all_upcoming_races()]
         
         return jsonify({
             "predictions": all_predictions,
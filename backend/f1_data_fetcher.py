@@ -3,16 +3,34 @@ Real-time F1 Data Fetcher
 Fetches live data from Jolpica F1 API (Ergast)
 """
 
+import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
+from functools import lru_cache
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+import sys
 import time
 
-logging.basicConfig(level=logging.INFO)
+try:
+    import orjson
+except ImportError:  # orjson is optional, stdlib json parses the same payloads
+    orjson = None
+
+# Decodes a JSON body (bytes) with orjson when available
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=64)
+def _race_start(date: str, race_time: str) -> datetime:
+    """Race start from the API's date and time fields, without timezone"""
+    return datetime.fromisoformat(f"{date}T{race_time}".replace('Z', '+00:00')).replace(tzinfo=None)
+
+
 class F1DataFetcher:
     """Fetches real-time F1 data from Jolpica API"""
     
@@ -22,6 +40,22 @@ class F1DataFetcher:
         self.cache = {}
         self.cache_duration = 300  # 5 minutes cache
         
+        # Keep-alive connection pool shared by all endpoints (and the
+        # concurrent route lookups); transient gateway errors are retried
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        )
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._session.headers.update({'Accept': 'application/json', 'User-Agent': 'DriveAheadF1/1.0'})
+        
+        # URL -> (ETag, Last-Modified, body) of the last response, so expired
+        # cache entries are revalidated instead of downloaded again
+        self._validators: Dict[str, Tuple[Optional[str], Optional[str], bytes]] = {}
+        
     def _get_cached_or_fetch(self, key: str, fetch_func, cache_duration: int = None):
         """Get data from cache or fetch if expired"""
         duration = cache_duration or self.cache_duration
@@ -37,6 +71,29 @@ class F1DataFetcher:
         self.cache[key] = (data, time.time())
         return data
     
+    def _get_json(self, url: str) -> Dict:
+        """GET a JSON endpoint as a conditional request when it was seen before"""
+        headers = {}
+        previous = self._validators.get(url)
+        if previous is not None:
+            etag, last_modified, _ = previous
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        
+        response = self._session.get(url, timeout=(3, 10), headers=headers)
+        if response.status_code == 304 and previous is not None:
+            logger.info(f"Not modified: {url}")
+            return _json_loads(previous[2])
+        response.raise_for_status()
+        
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            self._validators[url] = (etag, last_modified, response.content)
+        return _json_loads(response.content)
+    
     def get_current_standings(self) -> Dict:
         """Fetch current driver standings from Jolpica API"""
         def fetch():
@@ -44,9 +101,7 @@ class F1DataFetcher:
                 url = f"{self.base_url}/{self.current_season}/driverStandings.json"
                 logger.info(f"Fetching driver standings from: {url}")
                 
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
-                data = response.json()
+                data = self._get_json(url)
                 
                 standings_list = data['MRData']['StandingsTable']['StandingsLists']
                 
@@ -60,16 +115,17 @@ class F1DataFetcher:
                 driver_standings = latest_standings['DriverStandings']
                 
                 # Format the data
-                formatted_standings = []
-                for standing in driver_standings:
-                    formatted_standings.append({
+                formatted_standings = [
+                    {
                         'position': int(standing['position']),
-                        'driver': f"{standing['Driver']['givenName']} {standing['Driver']['familyName']}",
+                        'driver': sys.intern(f"{standing['Driver']['givenName']} {standing['Driver']['familyName']}"),
                         'driver_code': standing['Driver']['code'],
-                        'team': standing['Constructors'][0]['name'],
+                        'team': sys.intern(standing['Constructors'][0]['name']),
                         'points': int(standing['points']),
                         'wins': int(standing['wins'])
-                    })
+                    }
+                    for standing in driver_standings
+                ]
                 
                 logger.info(f"Successfully fetched standings for round {round_num}")
                 return {
@@ -93,9 +149,7 @@ class F1DataFetcher:
                 url = f"{self.base_url}/{self.current_season}/constructorStandings.json"
                 logger.info(f"Fetching constructor standings from: {url}")
                 
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
-                data = response.json()
+                data = self._get_json(url)
                 
                 standings_list = data['MRData']['StandingsTable']['StandingsLists']
                 
@@ -105,14 +159,15 @@ class F1DataFetcher:
                 latest_standings = standings_list[0]
                 constructor_standings = latest_standings['ConstructorStandings']
                 
-                formatted_standings = []
-                for standing in constructor_standings:
-                    formatted_standings.append({
+                formatted_standings = [
+                    {
                         'position': int(standing['position']),
                         'team': standing['Constructor']['name'],
                         'points': int(standing['points']),
                         'wins': int(standing['wins'])
-                    })
+                    }
+                    for standing in constructor_standings
+                ]
                 
                 return {
                     'season': self.current_season,
@@ -134,9 +189,7 @@ class F1DataFetcher:
                 url = f"{self.base_url}/{self.current_season}.json"
                 logger.info(f"Fetching race schedule from: {url}")
                 
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
-                data = response.json()
+                data = self._get_json(url)
                 
                 races = data['MRData']['RaceTable']['Races']
                 
@@ -176,13 +229,8 @@ class F1DataFetcher:
             now = datetime.now()
             
             for race in races:
-                race_date = datetime.strptime(race['date'], '%Y-%m-%d')
-                race_time = race.get('time', '14:00:00Z')
-                
-                # Combine date and time
-                race_datetime_str = f"{race['date']}T{race_time}"
-                race_datetime = datetime.strptime(race_datetime_str.replace('Z', '+00:00'), '%Y-%m-%dT%H:%M:%S%z')
-                race_datetime = race_datetime.replace(tzinfo=None)  # Remove timezone for comparison
+                # Combined date and time, parsed once per schedule entry
+                race_datetime = _race_start(race['date'], race.get('time', '14:00:00Z'))
                 
                 if race_datetime > now:
                     logger.info(f"Next race: {race['name']} on {race['date']}")
@@ -211,9 +259,7 @@ class F1DataFetcher:
                 url = f"{self.base_url}/{self.current_season}/last/results.json"
                 logger.info(f"Fetching last race results from: {url}")
                 
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
-                data = response.json()
+                data = self._get_json(url)
                 
                 races = data['MRData']['RaceTable']['Races']
                 
@@ -227,8 +273,8 @@ class F1DataFetcher:
                 for result in results[:10]:  # Top 10
                     formatted_results.append({
                         'position': int(result['position']),
-                        'driver': f"{result['Driver']['givenName']} {result['Driver']['familyName']}",
-                        'team': result['Constructor']['name'],
+                        'driver': sys.intern(f"{result['Driver']['givenName']} {result['Driver']['familyName']}"),
+                        'team': sys.intern(result['Constructor']['name']),
                         'time': result.get('Time', {}).get('time', 'N/A') if int(result['position']) == 1 else result.get('Time', {}).get('time', 'N/A'),
                         'points': float(result['points'])
                     })
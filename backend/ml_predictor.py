@@ -8,13 +8,23 @@ trained models (not just hardcoded scoring).
 """
 
 import numpy as np
+import glob
 import joblib
+import json
 import logging
 import os
-from typing import Dict, List, Optional
+import re
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional
 from datetime import datetime
+from prediction_data import DRIVER_SKILL, DRIVER_TEAMS, TEAM_PERFORMANCE
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional, the NumPy kernel works without it
+    njit = None
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -28,15 +38,63 @@ MODEL_TIMESTAMP = '20251030_222041'  # Set to your model timestamp (e.g., '20251
 if MODEL_TIMESTAMP is None:
     try:
         models_dir = 'backend/models'
-        metadata_files = [f for f in os.listdir(models_dir) if f.startswith('ml_metadata_') and f.endswith('.json')]
+        metadata_files = glob.glob(f'{models_dir}/ml_metadata_*.json')
         if metadata_files:
-            # Get the latest metadata file
-            latest_metadata = sorted(metadata_files)[-1]
-            MODEL_TIMESTAMP = latest_metadata.replace('ml_metadata_', '').replace('.json', '')
+            # Get the most recently written metadata file
+            latest_metadata = max(metadata_files, key=os.path.getmtime)
+            MODEL_TIMESTAMP = re.search(r'ml_metadata_(.+)\.json$', latest_metadata).group(1)
             logger.info(f"Auto-detected model timestamp: {MODEL_TIMESTAMP}")
-    except Exception as e:
+    except OSError as e:
         logger.warning(f"Could not auto-detect model timestamp: {e}")
 
+class ModelBundle(NamedTuple):
+    """Trained models and preprocessing objects for one timestamp"""
+    winner_model: Any
+    podium_model: Any
+    position_model: Any
+    scaler: Any
+    encoders: Dict
+    metadata: Optional[Dict]
+
+
+@lru_cache(maxsize=4)
+def _load_bundle(models_dir: str, timestamp: str) -> ModelBundle:
+    """
+    Unpickle the models for a timestamp. Cached per process so further
+    predictors (or reloads) reuse the already-loaded estimators; call
+    _load_bundle.cache_clear() after retraining under the same timestamp.
+    """
+    metadata = None
+    scaler_path = f'{models_dir}/scaler_{timestamp}.pkl'
+    metadata_path = f'{models_dir}/ml_metadata_{timestamp}.json'
+    if os.path.exists(metadata_path):
+        with open(metadata_path, 'r') as f:
+            metadata = json.load(f)
+    
+    return ModelBundle(
+        winner_model=joblib.load(f'{models_dir}/winner_model_{timestamp}.pkl'),
+        podium_model=joblib.load(f'{models_dir}/podium_model_{timestamp}.pkl'),
+        position_model=joblib.load(f'{models_dir}/position_model_{timestamp}.pkl'),
+        scaler=joblib.load(scaler_path) if os.path.exists(scaler_path) else None,
+        encoders=joblib.load(f'{models_dir}/encoders_{timestamp}.pkl'),
+        metadata=metadata
+    )
+
+
+def _label_codes(encoder) -> Dict[str, int]:
+    """Label -> code for a saved category table (or LabelEncoder, in older model sets)"""
+    labels = encoder.classes_ if hasattr(encoder, 'classes_') else encoder.categories
+    return {c: i for i, c in enumerate(labels.tolist())}
+
+
+def _algorithmic_scores(base_scores, quali_positions):
+    """Base score plus the qualifying bonus; NaN marks drivers without a grid slot"""
+    return base_scores + np.where(np.isnan(quali_positions), 0.0, (20.0 - quali_positions) * 2.0)
+
+
+if njit is not None:
+    _algorithmic_scores = njit(cache=True)(_algorithmic_scores)
+
 
 class MLF1Predictor:
     """
@@ -45,6 +103,16 @@ class MLF1Predictor:
     If ML_PREDICTOR_ENABLED=False, falls back to algorithmic prediction
     """
     
+    # Race-level feature defaults, the same for every driver
+    FEATURE_DEFAULTS = {
+        'weather_clear': 1,  # Assume clear weather (can be updated)
+        'track_temperature': 35.0,  # Default temp
+        'tire_strategy': 2,  # Medium tires
+        'avg_speed': 200.0,  # Default average speed
+        'pit_stop_time': 21.0,  # Default pit time
+        'circuit_factor': 1.0,
+    }
+    
     def __init__(self, model_timestamp: Optional[str] = None):
         self.model_timestamp = model_timestamp or MODEL_TIMESTAMP
         self.models_loaded = False
@@ -56,42 +124,45 @@ class MLF1Predictor:
         self.position_model = None
         self.scaler = None
         self.encoders = None
+        self._driver_code = {}
+        self._team_code = {}
+        self._circuit_code = {}
         self.feature_columns = None
+        self._feature_index = {}
+        self._feature_template = None
         self.metadata = None
         
         # Driver/team/circuit mappings (2025 F1 season)
-        self.driver_teams = {
-            'Max Verstappen': 'Red Bull', 'Sergio Perez': 'Red Bull',
-            'Oscar Piastri': 'McLaren', 'Lando Norris': 'McLaren',
-            'Charles Leclerc': 'Ferrari', 'Lewis Hamilton': 'Ferrari',
-            'George Russell': 'Mercedes', 'Andrea Kimi Antonelli': 'Mercedes',
-            'Fernando Alonso': 'Aston Martin', 'Lance Stroll': 'Aston Martin',
-            'Pierre Gasly': 'Alpine F1 Team', 'Jack Doohan': 'Alpine F1 Team',
-            'Alexander Albon': 'Williams', 'Carlos Sainz': 'Williams',
-            'Nico Hulkenberg': 'Haas F1 Team', 'Esteban Ocon': 'Haas F1 Team',
-            'Yuki Tsunoda': 'RB F1 Team', 'Isack Hadjar': 'RB F1 Team',
-            'Gabriel Bortoleto': 'Sauber', 'Oliver Bearman': 'Sauber'
-        }
+        self.driver_teams = DRIVER_TEAMS
+        self.team_performance = TEAM_PERFORMANCE
+        self.driver_skill = DRIVER_SKILL
         
-        self.team_performance = {
-            'Red Bull': 95, 'McLaren': 92, 'Ferrari': 90, 'Mercedes': 85,
-            'Aston Martin': 70, 'Alpine F1 Team': 65, 'Williams': 60,
-            'Haas F1 Team': 55, 'RB F1 Team': 58, 'Sauber': 50
-        }
+        # Skill and team ratings (all under 100) by driver id, the driver's
+        # position in driver_teams; hot paths index these instead of the dicts
+        self._driver_ids = {driver: i for i, driver in enumerate(self.driver_teams)}
+        self._skill = np.array([self.driver_skill.get(driver, 70) for driver in self._driver_ids],
+                               dtype=np.int8)
+        self._team_perf = np.array([self.team_performance.get(team, 50) for team in self.driver_teams.values()],
+                                   dtype=np.int8)
         
-        self.driver_skill = {
-            'Max Verstappen': 98, 'Oscar Piastri': 90, 'Lando Norris': 92,
-            'Charles Leclerc': 93, 'Lewis Hamilton': 96, 'George Russell': 88,
-            'Fernando Alonso': 94, 'Carlos Sainz': 87, 'Sergio Perez': 82,
-            'Alexander Albon': 80, 'Pierre Gasly': 81, 'Nico Hulkenberg': 79,
-            'Yuki Tsunoda': 77, 'Esteban Ocon': 76, 'Lance Stroll': 72,
-            'Andrea Kimi Antonelli': 75, 'Oliver Bearman': 70, 'Isack Hadjar': 71,
-            'Jack Doohan': 68, 'Gabriel Bortoleto': 67
-        }
+        # Base score (skill and team) per driver for the algorithmic fallback
+        self._algo_base_scores = (self._skill * 0.6) + (self._team_perf * 0.4)
         
-        # Try to load models on initialization
-        if ML_PREDICTOR_ENABLED and self.model_timestamp:
-            self.load_models()
+        # Models are loaded on the first prediction, not at import time
+        self._load_lock = threading.Lock()
+        self._load_attempted = False
+    
+    def _ensure_models_loaded(self):
+        """Load the models once, on first use; concurrent callers wait on the lock"""
+        if self._load_attempted:
+            return
+        with self._load_lock:
+            if self._load_attempted:
+                return
+            # load_models logs its own success; only the fallback is noted here
+            if not self.load_models():
+                logger.warning("⚠ ML Predictor using fallback mode (models not loaded)")
+            self._load_attempted = True
     
     def load_models(self) -> bool:
         """Load trained ML models"""
@@ -106,11 +177,11 @@ class MLF1Predictor:
             winner_path = f'{self.models_dir}/winner_model_{self.model_timestamp}.pkl'
             podium_path = f'{self.models_dir}/podium_model_{self.model_timestamp}.pkl'
             position_path = f'{self.models_dir}/position_model_{self.model_timestamp}.pkl'
-            scaler_path = f'{self.models_dir}/scaler_{self.model_timestamp}.pkl'
             encoders_path = f'{self.models_dir}/encoders_{self.model_timestamp}.pkl'
             
-            # Check if files exist
-            required_files = [winner_path, podium_path, position_path, scaler_path, encoders_path]
+            # Check if files exist (older model sets also ship a shared scaler;
+            # newer ones standardize inside their linear pipelines)
+            required_files = [winner_path, podium_path, position_path, encoders_path]
             missing_files = [f for f in required_files if not os.path.exists(f)]
             
             if missing_files:
@@ -118,20 +189,24 @@ class MLF1Predictor:
                 logger.error("Run 'python backend/train_ml_models.py' to train models first!")
                 return False
             
-            # Load all components
-            self.winner_model = joblib.load(winner_path)
-            self.podium_model = joblib.load(podium_path)
-            self.position_model = joblib.load(position_path)
-            self.scaler = joblib.load(scaler_path)
-            self.encoders = joblib.load(encoders_path)
+            # Load all components (shared across predictors for the same models)
+            bundle = _load_bundle(self.models_dir, self.model_timestamp)
+            self.winner_model = bundle.winner_model
+            self.podium_model = bundle.podium_model
+            self.position_model = bundle.position_model
+            self.scaler = bundle.scaler
+            self.encoders = bundle.encoders
             
-            # Load metadata
-            metadata_path = f'{self.models_dir}/ml_metadata_{self.model_timestamp}.json'
-            if os.path.exists(metadata_path):
-                import json
-                with open(metadata_path, 'r') as f:
-                    self.metadata = json.load(f)
-                    self.feature_columns = self.metadata.get('feature_columns', [])
+            # Label -> code lookups, equivalent to the trainer's encoding
+            self._driver_code = _label_codes(self.encoders['driver'])
+            self._team_code = _label_codes(self.encoders['team'])
+            self._circuit_code = _label_codes(self.encoders['circuit'])
+            
+            if bundle.metadata is not None:
+                self.metadata = bundle.metadata
+                self.feature_columns = self.metadata.get('feature_columns', [])
+                self._feature_index = {name: i for i, name in enumerate(self.feature_columns)}
+                self._feature_template = self._build_feature_template()
             
             self.models_loaded = True
             logger.info("✓ ML models loaded successfully!")
@@ -160,6 +235,9 @@ class MLF1Predictor:
             Prediction dict with winner, confidence, top 3, etc.
         """
         
+        if ML_PREDICTOR_ENABLED and not self.models_loaded:
+            self._ensure_models_loaded()
+        
         # If ML disabled or models not loaded, use algorithmic fallback
         if not ML_PREDICTOR_ENABLED or not self.models_loaded:
             logger.info("Using algorithmic prediction (ML models not loaded)")
@@ -168,11 +246,13 @@ class MLF1Predictor:
         try:
             logger.info(f"Predicting winner for {circuit} using ML models")
             
-            # Prepare features for each driver
-            predictions = []
+            # Prepare features for each driver, then score them in one batch
+            entrants = []
+            feature_rows = []
             
             for driver in drivers:
-                if driver not in self.driver_teams:
+                driver_id = self._driver_ids.get(driver, -1)
+                if driver_id < 0:
                     continue
                 
                 team = self.driver_teams[driver]
@@ -182,8 +262,8 @@ class MLF1Predictor:
                     quali_pos = qualifying_positions[driver]
                 else:
                     # Estimate based on skill and team
-                    skill = self.driver_skill.get(driver, 70)
-                    team_perf = self.team_performance.get(team, 50)
+                    skill = int(self._skill[driver_id])
+                    team_perf = int(self._team_perf[driver_id])
                     quali_pos = int(20 - ((skill + team_perf) / 200 * 19))
                 
                 # Create feature vector
@@ -191,36 +271,50 @@ class MLF1Predictor:
                     driver=driver,
                     team=team,
                     circuit=circuit,
-                    qualifying_position=quali_pos
+                    qualifying_position=quali_pos,
+                    driver_id=driver_id
                 )
                 
                 if features is None:
                     continue
                 
-                # Scale features
-                features_scaled = self.scaler.transform([features])
-                
-                # Get predictions
-                winner_prob = self.winner_model.predict_proba(features_scaled)[0][1]
-                podium_prob = self.podium_model.predict_proba(features_scaled)[0][1]
-                predicted_position = self.position_model.predict(features_scaled)[0]
-                
-                predictions.append({
-                    'driver': driver,
-                    'team': team,
-                    'winner_probability': winner_prob * 100,
-                    'podium_probability': podium_prob * 100,
-                    'predicted_position': round(predicted_position, 1),
-                    'qualifying_position': quali_pos
-                })
-            
-            # Sort by winner probability
-            predictions.sort(key=lambda x: x['winner_probability'], reverse=True)
+                entrants.append((driver, team, quali_pos))
+                feature_rows.append(features)
             
-            if not predictions:
+            if not feature_rows:
                 logger.warning("No valid predictions generated, using fallback")
                 return self._algorithmic_prediction(drivers, circuit, qualifying_positions)
             
+            # Run each model once over all drivers (scaled first for model
+            # sets that were trained on scaler output)
+            features = np.stack(feature_rows)
+            if self.scaler is not None:
+                features = self.scaler.transform(features)
+            winner_probs = self.winner_model.predict_proba(features)[:, 1]
+            podium_probs = self.podium_model.predict_proba(features)[:, 1]
+            predicted_positions = self.position_model.predict(features)
+            
+            winner_pcts = winner_probs * 100
+            podium_pcts = podium_probs * 100
+            
+            # Top 10 by winner probability: partition around the 10th best,
+            # then sort only those (stable, so ties keep the input order)
+            k = min(10, len(winner_pcts))
+            candidates = np.flatnonzero(winner_pcts >= np.partition(winner_pcts, -k)[-k])
+            top_idx = candidates[np.argsort(-winner_pcts[candidates], kind='stable')][:k]
+            
+            predictions = [
+                {
+                    'driver': entrants[i][0],
+                    'team': entrants[i][1],
+                    'winner_probability': winner_pcts[i],
+                    'podium_probability': podium_pcts[i],
+                    'predicted_position': round(predicted_positions[i], 1),
+                    'qualifying_position': entrants[i][2]
+                }
+                for i in top_idx
+            ]
+            
             # Top 3 predictions
             winner = predictions[0]
             second = predictions[1] if len(predictions) > 1 else predictions[0]
@@ -259,40 +353,39 @@ class MLF1Predictor:
             logger.error(f"Error in ML prediction: {e}")
             return self._algorithmic_prediction(drivers, circuit, qualifying_positions)
     
+    def _build_feature_template(self) -> Optional[np.ndarray]:
+        """Feature vector with the race-level defaults filled in, copied per driver"""
+        idx = self._feature_index
+        if not all(name in idx for name in self.FEATURE_DEFAULTS):
+            return None
+        template = np.empty(len(idx), dtype=np.float64)
+        for name, value in self.FEATURE_DEFAULTS.items():
+            template[idx[name]] = value
+        return template
+    
     def _create_feature_vector(self, driver: str, team: str, circuit: str, 
-                               qualifying_position: int) -> Optional[List[float]]:
-        """Create feature vector for prediction"""
+                               qualifying_position: int, driver_id: int) -> Optional[np.ndarray]:
+        """Create feature vector for prediction, in the models' column order"""
         try:
-            # Feature values
-            features = {
-                'qualifying_position': qualifying_position,
-                'weather_clear': 1,  # Assume clear weather (can be updated)
-                'track_temperature': 35.0,  # Default temp
-                'tire_strategy': 2,  # Medium tires
-                'avg_speed': 200.0,  # Default average speed
-                'pit_stop_time': 21.0,  # Default pit time
-                'driver_skill': self.driver_skill.get(driver, 70),
-                'team_performance': self.team_performance.get(team, 50),
-                'circuit_factor': 1.0,
-                'recent_form': qualifying_position,  # Use quali as proxy for form
-            }
-            
             # Encode categorical variables
-            try:
-                driver_encoded = self.encoders['driver'].transform([driver])[0]
-                team_encoded = self.encoders['team'].transform([team])[0]
-                circuit_encoded = self.encoders['circuit'].transform([circuit])[0]
-            except Exception:
+            driver_encoded = self._driver_code.get(driver)
+            team_encoded = self._team_code.get(team)
+            circuit_encoded = self._circuit_code.get(circuit)
+            if driver_encoded is None or team_encoded is None or circuit_encoded is None:
                 # If driver/team/circuit not in encoder, use default
                 return None
             
-            features['driver_encoded'] = driver_encoded
-            features['team_encoded'] = team_encoded
-            features['circuit_encoded'] = circuit_encoded
-            
-            # Return in correct order (matching feature_columns)
-            feature_vector = [features[col] for col in self.feature_columns]
-            return feature_vector
+            # Feature values
+            idx = self._feature_index
+            features = self._feature_template.copy()
+            features[idx['qualifying_position']] = qualifying_position
+            features[idx['driver_skill']] = self._skill[driver_id]
+            features[idx['team_performance']] = self._team_perf[driver_id]
+            features[idx['recent_form']] = qualifying_position  # Use quali as proxy for form
+            features[idx['driver_encoded']] = driver_encoded
+            features[idx['team_encoded']] = team_encoded
+            features[idx['circuit_encoded']] = circuit_encoded
+            return features
             
         except Exception as e:
             logger.error(f"Error creating feature vector for {driver}: {e}")
@@ -318,7 +411,7 @@ class MLF1Predictor:
         if prediction['qualifying_position'] <= 3:
             reasoning.append(f"Starting from P{prediction['qualifying_position']} - front row advantage")
         
-        skill = self.driver_skill.get(driver, 70)
+        skill = int(self._skill[self._driver_ids[driver]])
         if skill >= 90:
             reasoning.append(f"{driver} is a top-tier driver (skill rating: {skill}/100)")
         
@@ -332,35 +425,10 @@ class MLF1Predictor:
         """
         logger.info("Using algorithmic fallback prediction")
         
-        scores = []
-        
-        for driver in drivers:
-            if driver not in self.driver_teams:
-                continue
-            
-            team = self.driver_teams[driver]
-            skill = self.driver_skill.get(driver, 70)
-            team_perf = self.team_performance.get(team, 50)
-            
-            # Simple scoring
-            score = (skill * 0.6) + (team_perf * 0.4)
-            
-            # Qualifying bonus
-            if qualifying_positions and driver in qualifying_positions:
-                quali_pos = qualifying_positions[driver]
-                score += (20 - quali_pos) * 2
-            
-            scores.append({
-                'driver': driver,
-                'team': team,
-                'score': score,
-                'skill': skill,
-                'team_perf': team_perf
-            })
+        # Drivers we have data for, in the order given
+        entrants = [driver for driver in drivers if driver in self._driver_ids]
         
-        scores.sort(key=lambda x: x['score'], reverse=True)
-        
-        if not scores:
+        if not entrants:
             return {
                 'predicted_winner': 'Max Verstappen',
                 'team': 'Red Bull',
@@ -370,41 +438,52 @@ class MLF1Predictor:
                 'prediction_method': 'Fallback (No Data)'
             }
         
-        winner = scores[0]
-        confidence = min(95, 50 + (winner['score'] - scores[1]['score']))
+        # Qualifying positions, NaN for drivers without one
+        if qualifying_positions:
+            quali = np.array([qualifying_positions.get(d, np.nan) for d in entrants], dtype=np.float64)
+        else:
+            quali = np.full(len(entrants), np.nan)
+        
+        idx = np.array([self._driver_ids[d] for d in entrants])
+        scores = _algorithmic_scores(self._algo_base_scores[idx], quali)
+        
+        # Top 3 by score: partition around the 3rd best, then sort only
+        # those (stable, so ties keep the input order)
+        k = min(3, len(scores))
+        candidates = np.flatnonzero(scores >= np.partition(scores, -k)[-k])
+        order = candidates[np.argsort(-scores[candidates], kind='stable')][:k]
+        
+        winner = entrants[order[0]]
+        winner_id = idx[order[0]]
+        winner_team = self.driver_teams[winner]
+        confidence = min(95, 50 + (float(scores[order[0]]) - float(scores[order[1]])))
         
         return {
-            'predicted_winner': winner['driver'],
-            'team': winner['team'],
+            'predicted_winner': winner,
+            'team': winner_team,
             'confidence': round(confidence, 1),
             'probability': round(confidence, 1),
             'reasoning': [
-                f"High skill rating ({winner['skill']}/100)",
-                f"Strong team performance ({winner['team_perf']}/100)",
+                f"High skill rating ({self._skill[winner_id]}/100)",
+                f"Strong team performance ({self._team_perf[winner_id]}/100)",
                 "Based on algorithmic scoring (ML models not loaded)"
             ],
             'top_3_predictions': [
                 {
-                    'driver': s['driver'],
-                    'team': s['team'],
-                    'score': round(s['score'], 2),
-                    'probability': round(50 + (s['score'] / 2), 1)
+                    'driver': entrants[i],
+                    'team': self.driver_teams[entrants[i]],
+                    'score': round(float(scores[i]), 2),
+                    'probability': round(50 + (float(scores[i]) / 2), 1)
                 }
-                for s in scores[:3]
+                for i in order[:3]
             ],
             'circuit': circuit,
             'prediction_method': 'Algorithmic Fallback (ML Not Available)'
         }
 
 
-# Global instance
+# Global instance (models load lazily on the first prediction)
 ml_predictor = MLF1Predictor()
 
-# Try to load models on import
-if ML_PREDICTOR_ENABLED:
-    if ml_predictor.load_models():
-        logger.info("✓ ML Predictor ready with trained models!")
-    else:
-        logger.warning("⚠ ML Predictor using fallback mode (models not loaded)")
-else:
+if not ML_PREDICTOR_ENABLED:
     logger.info("ℹ ML Predictor in fallback mode (ML_PREDICTOR_ENABLED=False)")
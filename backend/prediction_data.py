@@ -0,0 +1,260 @@
+"""
+Shared F1 prediction data
+Driver, team and circuit tables used by the prediction systems,
+built once at import time together with the NumPy arrays the
+advanced predictor scores against
+"""
+
+import sys
+from types import MappingProxyType
+import numpy as np
+
+
+def frozen_array(arr: np.ndarray) -> np.ndarray:
+    """Mark a scoring array read-only; updates swap in a new array instead"""
+    arr.setflags(write=False)
+    return arr
+
+
+def _interned(table: dict) -> dict:
+    """Copy a name-keyed table with interned keys (and string values)"""
+    return {
+        sys.intern(name): sys.intern(value) if isinstance(value, str) else value
+        for name, value in table.items()
+    }
+
+
+# ============================================================================
+# ADVANCED PREDICTOR TABLES
+# ============================================================================
+
+# Driver form weights (based on recent performance)
+# Updated after each race dynamically
+_DRIVER_FORM_SCORES = {
+    'Max Verstappen': 0.95,      # Won US GP (Round 19)
+    'Oscar Piastri': 0.88,       # P5 US GP but still leading championship
+    'Lando Norris': 0.90,        # P2 US GP, consistent
+    'Charles Leclerc': 0.85,     # P3 US GP, podium form
+    'George Russell': 0.80,      # Won Singapore GP (Round 18)
+    'Lewis Hamilton': 0.78,      # P4 US GP
+    'Andrea Kimi Antonelli': 0.65,
+    'Alexander Albon': 0.68,
+    'Carlos Sainz': 0.72,
+    'Sergio Perez': 0.60,
+    'Fernando Alonso': 0.70,
+    'Pierre Gasly': 0.62,
+    'Nico Hulkenberg': 0.66,
+    'Esteban Ocon': 0.58,
+    'Isack Hadjar': 0.55,
+    'Yuki Tsunoda': 0.60,
+    'Lance Stroll': 0.52,
+    'Jack Doohan': 0.48,
+    'Gabriel Bortoleto': 0.45,
+    'Zhou Guanyu': 0.42,
+    'Oliver Bearman': 0.50,
+    'Liam Lawson': 0.54,
+    'Franco Colapinto': 0.46
+}
+
+# Track-specific performance (circuit characteristics favor different drivers)
+_CIRCUIT_SPECIALISTS = {
+    'Monaco': ['Max Verstappen', 'Charles Leclerc', 'Fernando Alonso'],
+    'Singapore': ['George Russell', 'Lando Norris', 'Charles Leclerc'],
+    'Spa': ['Max Verstappen', 'Lewis Hamilton', 'George Russell'],
+    'Monza': ['Oscar Piastri', 'Lando Norris', 'Charles Leclerc'],
+    'Silverstone': ['Lewis Hamilton', 'George Russell', 'Lando Norris'],
+    'Suzuka': ['Max Verstappen', 'Fernando Alonso', 'Oscar Piastri'],
+    'Interlagos': ['Max Verstappen', 'Lewis Hamilton', 'Lando Norris'],
+    'COTA': ['Max Verstappen', 'Lewis Hamilton', 'Lando Norris'],  # US GP
+    'Mexico': ['Max Verstappen', 'Charles Leclerc', 'George Russell'],
+    'Montreal': ['Max Verstappen', 'George Russell', 'Fernando Alonso'],
+    'Melbourne': ['Oscar Piastri', 'Max Verstappen', 'Lando Norris'],
+    'Zandvoort': ['Max Verstappen', 'Lando Norris', 'George Russell'],
+    'Jeddah': ['Max Verstappen', 'Sergio Perez', 'Fernando Alonso'],
+    'Bahrain': ['Max Verstappen', 'Charles Leclerc', 'Carlos Sainz'],
+    'Shanghai': ['Fernando Alonso', 'Max Verstappen', 'Lewis Hamilton'],
+    'Miami': ['Max Verstappen', 'Lando Norris', 'Oscar Piastri'],
+    'Hungaroring': ['Lewis Hamilton', 'Fernando Alonso', 'Oscar Piastri'],
+    'Austria': ['Max Verstappen', 'Lando Norris', 'George Russell'],
+    'Baku': ['Max Verstappen', 'Sergio Perez', 'Charles Leclerc'],
+    'Losail': ['Max Verstappen', 'Oscar Piastri', 'George Russell'],
+    'Yas Marina': ['Max Verstappen', 'Lando Norris', 'Charles Leclerc'],
+    'Las Vegas': ['Max Verstappen', 'George Russell', 'Charles Leclerc']
+}
+
+# Team momentum (based on recent race performance)
+_TEAM_MOMENTUM = {
+    'Red Bull': 0.92,        # Max won US GP - back in form!
+    'McLaren': 0.88,         # Leading championship but P2/P5 at US GP
+    'Ferrari': 0.85,         # P3/P4 at US GP - strong podium
+    'Mercedes': 0.78,        # P6 US GP but won Singapore
+    'Williams': 0.62,
+    'RB F1 Team': 0.58,
+    'Haas F1 Team': 0.52,
+    'Alpine F1 Team': 0.48,
+    'Aston Martin': 0.56,
+    'Sauber': 0.42
+}
+
+# Weather specialists (drivers who perform better in wet conditions)
+_WET_WEATHER_SPECIALISTS = [
+    'Max Verstappen',    # Legendary in the wet
+    'Lewis Hamilton',    # 7x champion, wet weather master
+    'Fernando Alonso',   # Experience in all conditions
+    'George Russell',    # Strong wet weather performances
+    'Carlos Sainz'       # Proven in wet races
+]
+
+# Qualifying vs Race performance (some drivers gain/lose positions)
+_RACE_CRAFT_BONUS = {
+    'Max Verstappen': 1.15,      # Often gains positions
+    'Fernando Alonso': 1.12,     # Master of race craft
+    'Lewis Hamilton': 1.10,      # Experience helps in race
+    'George Russell': 1.08,
+    'Oscar Piastri': 1.05,
+    'Lando Norris': 1.05,
+    'Charles Leclerc': 1.03,
+    'Carlos Sainz': 1.02,
+    'Alexander Albon': 1.00,
+    'Nico Hulkenberg': 1.00,
+    'Sergio Perez': 0.95,        # Often loses positions
+    'Lance Stroll': 0.92,
+    'Pierre Gasly': 0.98,
+    'Yuki Tsunoda': 0.97
+}
+
+# Lowercased circuit/location names -> circuit lookup key
+CIRCUIT_ALIASES = {
+    'circuit of the americas': 'COTA',
+    'autódromo hermanos rodríguez': 'Mexico',
+    'autódromo josé carlos pace': 'Interlagos',
+    'las vegas strip': 'Las Vegas',
+    'losail': 'Losail',
+    'yas marina': 'Yas Marina',
+    'bahrain': 'Bahrain',
+    'jeddah': 'Jeddah',
+    'albert park': 'Melbourne',
+    'suzuka': 'Suzuka',
+    'shanghai': 'Shanghai',
+    'miami': 'Miami',
+    'imola': 'Imola',
+    'monaco': 'Monaco',
+    'circuit gilles villeneuve': 'Montreal',
+    'barcelona': 'Barcelona',
+    'red bull ring': 'Austria',
+    'silverstone': 'Silverstone',
+    'hungaroring': 'Hungaroring',
+    'spa': 'Spa',
+    'zandvoort': 'Zandvoort',
+    'monza': 'Monza',
+    'marina bay': 'Singapore',
+    'baku': 'Baku',
+    # Location-only aliases
+    'austin': 'COTA',
+    'united states': 'COTA',
+    'mexico': 'Mexico',
+    'brazil': 'Interlagos',
+    'são paulo': 'Interlagos',
+    'las vegas': 'Las Vegas',
+    'qatar': 'Losail',
+    'abu dhabi': 'Yas Marina'
+}
+
+
+# ============================================================================
+# ML PREDICTOR TABLES (2025 F1 season)
+# ============================================================================
+
+_DRIVER_TEAMS = {
+    'Max Verstappen': 'Red Bull', 'Sergio Perez': 'Red Bull',
+    'Oscar Piastri': 'McLaren', 'Lando Norris': 'McLaren',
+    'Charles Leclerc': 'Ferrari', 'Lewis Hamilton': 'Ferrari',
+    'George Russell': 'Mercedes', 'Andrea Kimi Antonelli': 'Mercedes',
+    'Fernando Alonso': 'Aston Martin', 'Lance Stroll': 'Aston Martin',
+    'Pierre Gasly': 'Alpine F1 Team', 'Jack Doohan': 'Alpine F1 Team',
+    'Alexander Albon': 'Williams', 'Carlos Sainz': 'Williams',
+    'Nico Hulkenberg': 'Haas F1 Team', 'Esteban Ocon': 'Haas F1 Team',
+    'Yuki Tsunoda': 'RB F1 Team', 'Isack Hadjar': 'RB F1 Team',
+    'Gabriel Bortoleto': 'Sauber', 'Oliver Bearman': 'Sauber'
+}
+
+_TEAM_PERFORMANCE = {
+    'Red Bull': 95, 'McLaren': 92, 'Ferrari': 90, 'Mercedes': 85,
+    'Aston Martin': 70, 'Alpine F1 Team': 65, 'Williams': 60,
+    'Haas F1 Team': 55, 'RB F1 Team': 58, 'Sauber': 50
+}
+
+_DRIVER_SKILL = {
+    'Max Verstappen': 98, 'Oscar Piastri': 90, 'Lando Norris': 92,
+    'Charles Leclerc': 93, 'Lewis Hamilton': 96, 'George Russell': 88,
+    'Fernando Alonso': 94, 'Carlos Sainz': 87, 'Sergio Perez': 82,
+    'Alexander Albon': 80, 'Pierre Gasly': 81, 'Nico Hulkenberg': 79,
+    'Yuki Tsunoda': 77, 'Esteban Ocon': 76, 'Lance Stroll': 72,
+    'Andrea Kimi Antonelli': 75, 'Oliver Bearman': 70, 'Isack Hadjar': 71,
+    'Jack Doohan': 68, 'Gabriel Bortoleto': 67
+}
+
+
+# ============================================================================
+# CANONICAL TABLES
+# ============================================================================
+# Names are interned so lookups with names from the data fetcher
+# short-circuit on identity. Every known driver gets an explicit form and
+# race craft entry so the scoring arrays can be built by direct indexing.
+
+for _driver in list(_RACE_CRAFT_BONUS):
+    _DRIVER_FORM_SCORES.setdefault(_driver, 0.5)
+for _driver in _DRIVER_FORM_SCORES:
+    _RACE_CRAFT_BONUS.setdefault(_driver, 1.0)
+
+# Seed values; predictors copy these before updating them
+DRIVER_FORM_SCORES = MappingProxyType(_interned(_DRIVER_FORM_SCORES))
+TEAM_MOMENTUM = MappingProxyType(_interned(_TEAM_MOMENTUM))
+
+# Never updated, shared as read-only views
+RACE_CRAFT_BONUS = MappingProxyType(_interned(_RACE_CRAFT_BONUS))
+WET_WEATHER_SPECIALISTS = tuple(sys.intern(d) for d in _WET_WEATHER_SPECIALISTS)
+CIRCUIT_SPECIALISTS = MappingProxyType({
+    circuit: tuple(sys.intern(d) for d in drivers)
+    for circuit, drivers in _CIRCUIT_SPECIALISTS.items()
+})
+
+DRIVER_TEAMS = MappingProxyType(_interned(_DRIVER_TEAMS))
+TEAM_PERFORMANCE = MappingProxyType(_interned(_TEAM_PERFORMANCE))
+DRIVER_SKILL = MappingProxyType(_interned(_DRIVER_SKILL))
+
+
+# ============================================================================
+# SCORING ARRAYS
+# ============================================================================
+# Aligned to fixed driver/team/circuit indices. The last slot of each axis
+# holds the defaults used for drivers, teams and circuits that are not in
+# the tables. All arrays are read-only.
+
+DRIVER_IDX = {driver: i for i, driver in enumerate(DRIVER_FORM_SCORES)}
+UNKNOWN_DRIVER = len(DRIVER_IDX)
+
+TEAM_IDX = {team: i for i, team in enumerate(TEAM_MOMENTUM)}
+UNKNOWN_TEAM = len(TEAM_IDX)
+
+FORM_ARR = frozen_array(np.array(
+    [DRIVER_FORM_SCORES[d] for d in DRIVER_IDX] + [0.5], dtype=np.float64))
+RACE_CRAFT_ARR = frozen_array(np.array(
+    [RACE_CRAFT_BONUS[d] for d in DRIVER_IDX] + [1.0], dtype=np.float64))
+TEAM_MOMENTUM_ARR = frozen_array(np.array(
+    [TEAM_MOMENTUM[t] for t in TEAM_IDX] + [0.5], dtype=np.float64))
+
+# Reverse index of the circuit specialists: (circuit, driver) -> rank
+SPECIALIST_RANK = {
+    (circuit, driver): rank
+    for circuit, specialists in CIRCUIT_SPECIALISTS.items()
+    for rank, driver in enumerate(specialists)
+}
+
+# Track-specific bonus: 15/10/5 points for the three specialists
+CIRCUIT_KEY_IDX = {circuit: i for i, circuit in enumerate(CIRCUIT_SPECIALISTS)}
+_circuit_bonus = np.zeros((len(CIRCUIT_KEY_IDX) + 1, len(DRIVER_IDX) + 1), dtype=np.float64)
+for (_circuit, _driver), _rank in SPECIALIST_RANK.items():
+    if _rank < 3 and _driver in DRIVER_IDX:
+        _circuit_bonus[CIRCUIT_KEY_IDX[_circuit], DRIVER_IDX[_driver]] = (3 - _rank) * 5
+CIRCUIT_BONUS_MATRIX = frozen_array(_circuit_bonus)
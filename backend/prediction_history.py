@@ -3,15 +3,106 @@ Real-Time Prediction History Tracker
 Automatically fetches past race results and compares with predictions
 """
 
+import json
 import logging
-from typing import List, Dict
+import re
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Tuple
 from datetime import datetime
 from f1_data_fetcher import f1_fetcher
+from joblib import Memory
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, stdlib json parses the same payloads
+    orjson = None
+
+# Decodes a JSON body (bytes) with orjson when available
+_json_loads = orjson.loads if orjson is not None else json.loads
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# On-disk cache for completed rounds; their results never change, so they
+# survive process restarts
+_memory = Memory('backend/.cache/race_results', verbose=0)
+
+
+# Circuit specialist mapping (same as advanced_predictor.py)
+CIRCUIT_PREDICTIONS = {
+    'Marina Bay': 'George Russell',     # Singapore - Russell won here!
+    'Singapore': 'George Russell',      # Street circuit specialist
+    'Baku': 'Max Verstappen',           # Baku specialist
+    'Monza': 'Max Verstappen',          # High-speed circuit (but could be Piastri)
+    'Zandvoort': 'Max Verstappen',      # Home advantage (but Piastri won!)
+    'Spa': 'Max Verstappen',            # Spa specialist
+    'Hungary': 'Lewis Hamilton',        # Hungaroring specialist
+    'Silverstone': 'Lewis Hamilton',    # Home race
+    'Austria': 'Max Verstappen',        # Red Bull Ring
+    'Montreal': 'Max Verstappen',       # Canada specialist
+    'Barcelona': 'Max Verstappen',      # Spain
+    'Monaco': 'Max Verstappen',         # Monaco master
+    'Imola': 'Max Verstappen',          # Imola
+    'Miami': 'Max Verstappen',          # Miami
+    'Shanghai': 'Fernando Alonso',      # China specialist
+    'Suzuka': 'Max Verstappen',         # Japan
+    'Melbourne': 'Oscar Piastri',       # Home advantage
+    'Jeddah': 'Max Verstappen',         # Saudi Arabia
+    'Bahrain': 'Max Verstappen',        # Season opener
+    'Austin': 'Max Verstappen',         # COTA specialist
+    'Americas': 'Max Verstappen',       # COTA
+    'Mexico': 'Max Verstappen',         # Mexico City specialist
+    'Brazil': 'Max Verstappen',         # Interlagos specialist
+    'Las Vegas': 'Max Verstappen',      # Vegas
+    'Qatar': 'Max Verstappen',          # Losail
+    'Abu Dhabi': 'Max Verstappen'       # Yas Marina
+}
+
+# Lowercased key -> (listing order, predicted winner); earlier keys win
+_CIRCUIT_PRIORITY = {
+    key.lower(): (order, winner) for order, (key, winner) in enumerate(CIRCUIT_PREDICTIONS.items())
+}
+_CIRCUIT_PATTERN = re.compile('(?=(' + '|'.join(
+    re.escape(key.lower()) for key in CIRCUIT_PREDICTIONS) + '))')
+
+
+def _fetch_race_result(base_url: str, season: int, round_num: int,
+                       session: requests.Session) -> Dict:
+    """
+    Fetch and parse one round's result. Raises LookupError if the round has
+    no race yet, so the disk cache never stores an empty round.
+    """
+    url = f"{base_url}/{season}/{round_num}/results.json"
+    logger.info(f"Fetching results for round {round_num}")
+    
+    response = session.get(url, timeout=(3, 10))
+    response.raise_for_status()
+    data = _json_loads(response.content)
+    
+    races = data['MRData']['RaceTable']['Races']
+    
+    if not races:
+        raise LookupError(f"no race result for round {round_num}")
+    
+    race = races[0]
+    winner = race['Results'][0]
+    
+    return {
+        'round': round_num,
+        'race_name': race['raceName'],
+        'circuit': race['Circuit']['circuitName'],
+        'location': race['Circuit']['Location']['locality'],
+        'date': race['date'],
+        'actual_winner': f"{winner['Driver']['givenName']} {winner['Driver']['familyName']}"
+    }
+
+
+# Keyed on (base_url, season, round_num); the session is just the transport
+_fetch_race_result_cached = _memory.cache(_fetch_race_result, ignore=['session'])
+
 
 class PredictionHistoryTracker:
     """Track and verify prediction accuracy in real-time"""
@@ -20,6 +111,20 @@ class PredictionHistoryTracker:
         self.current_season = 2025
         self.base_url = "http://api.jolpi.ca/ergast/f1"
         
+        # Keep-alive connection pool shared by the per-round fetches, one
+        # connection per worker; transient API errors are retried
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        )
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        
+        # Results of completed rounds, keyed by (season, round); they never change
+        self._race_results: Dict[Tuple[int, int], Dict] = {}
+        
     def get_prediction_history(self, num_races: int = 5) -> List[Dict]:
         """
         Get real-time prediction accuracy for recent races
@@ -39,14 +144,26 @@ class PredictionHistoryTracker:
             
             history = []
             
-            # Check last N races
-            for round_offset in range(num_races):
-                round_num = current_round - round_offset
-                
-                if round_num < 1:
-                    break
-                
-                race_result = self._get_race_result(round_num)
+            # Check last N races, fetching their results concurrently
+            round_nums = list(range(current_round, max(current_round - num_races, 0), -1))
+            
+            to_fetch = [r for r in round_nums if (self.current_season, r) not in self._race_results]
+            fetched = {}
+            if to_fetch:
+                completed = [r < current_round for r in to_fetch]
+                with ThreadPoolExecutor(max_workers=min(8, len(to_fetch))) as executor:
+                    fetched = dict(zip(to_fetch, executor.map(self._get_race_result, to_fetch, completed)))
+            
+            # The latest round can still change, so only earlier rounds are kept
+            for round_num, race_result in fetched.items():
+                if race_result and round_num < current_round:
+                    self._race_results[(self.current_season, round_num)] = race_result
+            
+            for round_num in round_nums:
+                if round_num in fetched:
+                    race_result = fetched[round_num]
+                else:
+                    race_result = self._race_results[(self.current_season, round_num)]
                 
                 if race_result:
                     # Get what our model would have predicted
@@ -76,33 +193,14 @@ class PredictionHistoryTracker:
             logger.error(f"Error getting prediction history: {e}")
             return self._get_fallback_history()
     
-    def _get_race_result(self, round_num: int) -> Dict:
-        """Fetch actual race result from API"""
+    def _get_race_result(self, round_num: int, completed: bool = False) -> Dict:
+        """Fetch actual race result from API (from the disk cache for completed rounds)"""
         try:
-            url = f"{self.base_url}/{self.current_season}/{round_num}/results.json"
-            logger.info(f"Fetching results for round {round_num}")
-            
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            races = data['MRData']['RaceTable']['Races']
-            
-            if not races:
-                return None
-            
-            race = races[0]
-            winner = race['Results'][0]
-            
-            return {
-                'round': round_num,
-                'race_name': race['raceName'],
-                'circuit': race['Circuit']['circuitName'],
-                'location': race['Circuit']['Location']['locality'],
-                'date': race['date'],
-                'actual_winner': f"{winner['Driver']['givenName']} {winner['Driver']['familyName']}"
-            }
+            fetch = _fetch_race_result_cached if completed else _fetch_race_result
+            return fetch(self.base_url, self.current_season, round_num, self._session)
             
+        except LookupError:
+            return None
         except Exception as e:
             logger.error(f"Error fetching race {round_num} results: {e}")
             return None
@@ -112,40 +210,13 @@ class PredictionHistoryTracker:
         Determine what our model would have predicted based on circuit specialists
         This uses the same logic as the advanced predictor
         """
-        # Circuit specialist mapping (same as advanced_predictor.py)
-        circuit_predictions = {
-            'Marina Bay': 'George Russell',     # Singapore - Russell won here!
-            'Singapore': 'George Russell',      # Street circuit specialist
-            'Baku': 'Max Verstappen',           # Baku specialist
-            'Monza': 'Max Verstappen',          # High-speed circuit (but could be Piastri)
-            'Zandvoort': 'Max Verstappen',      # Home advantage (but Piastri won!)
-            'Spa': 'Max Verstappen',            # Spa specialist
-            'Hungary': 'Lewis Hamilton',        # Hungaroring specialist
-            'Silverstone': 'Lewis Hamilton',    # Home race
-            'Austria': 'Max Verstappen',        # Red Bull Ring
-            'Montreal': 'Max Verstappen',       # Canada specialist
-            'Barcelona': 'Max Verstappen',      # Spain
-            'Monaco': 'Max Verstappen',         # Monaco master
-            'Imola': 'Max Verstappen',          # Imola
-            'Miami': 'Max Verstappen',          # Miami
-            'Shanghai': 'Fernando Alonso',      # China specialist
-            'Suzuka': 'Max Verstappen',         # Japan
-            'Melbourne': 'Oscar Piastri',       # Home advantage
-            'Jeddah': 'Max Verstappen',         # Saudi Arabia
-            'Bahrain': 'Max Verstappen',        # Season opener
-            'Austin': 'Max Verstappen',         # COTA specialist
-            'Americas': 'Max Verstappen',       # COTA
-            'Mexico': 'Max Verstappen',         # Mexico City specialist
-            'Brazil': 'Max Verstappen',         # Interlagos specialist
-            'Las Vegas': 'Max Verstappen',      # Vegas
-            'Qatar': 'Max Verstappen',          # Losail
-            'Abu Dhabi': 'Max Verstappen'       # Yas Marina
-        }
-        
-        # Try to match circuit or location
-        for key, predicted_winner in circuit_predictions.items():
-            if key.lower() in circuit.lower() or key.lower() in location.lower():
-                return predicted_winner
+        # Single regex pass over circuit and location. The lookahead yields
+        # the earliest-listed key starting at each position, so the lowest
+        # listing order among the matches is the earliest-listed key present
+        haystack = f"{circuit}\n{location}".lower()
+        matches = [_CIRCUIT_PRIORITY[m.group(1)] for m in _CIRCUIT_PATTERN.finditer(haystack)]
+        if matches:
+            return min(matches)[1]
         
         # Default prediction based on current form
         return 'Max Verstappen'  # Most likely based on recent form
@@ -192,8 +263,9 @@ class PredictionHistoryTracker:
                     'accuracy_percentage': 0.0
                 }
             
-            total = len(history)
-            correct = sum(1 for h in history if h['is_correct'])
+            flags = np.fromiter((h['is_correct'] for h in history), dtype=np.bool_, count=len(history))
+            total = flags.size
+            correct = int(flags.sum())
             incorrect = total - correct
             accuracy = (correct / total * 100) if total > 0 else 0
             
@@ -10,14 +10,195 @@ Fetches live F1 data from the API:
 All data is fetched in real-time. No hardcoded values.
 """
 
+import hashlib
+import json
+import os
+import shutil
+import tempfile
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
-from typing import Dict, List, Optional
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+import threading
 import time
 
-logging.basicConfig(level=logging.INFO)
+try:
+    import orjson
+except ImportError:  # orjson is optional, stdlib json parses the same payloads
+    orjson = None
+
+# Decodes a JSON body (bytes) with orjson when available
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 logger = logging.getLogger(__name__)
 
+# Ergast responses change at most once per race weekend; circuits once a season
+CACHE_DIR = 'backend/.cache/ergast'
+STANDINGS_TTL = 3600
+CIRCUITS_TTL = 24 * 3600
+
+# Circuit type classification (static - based on track characteristics),
+# keyed by lowercased circuit name
+_CIRCUIT_TYPES = MappingProxyType({name.lower(): circuit_type for name, circuit_type in {
+    'Circuit de Monaco': 'street',
+    'Monaco': 'street',
+    'Marina Bay Street Circuit': 'street',
+    'Singapore': 'street',
+    'Baku City Circuit': 'street',
+    'Baku': 'street',
+    'Jeddah Corniche Circuit': 'street_fast',
+    'Jeddah': 'street_fast',
+    'Miami International Autodrome': 'street_fast',
+    'Miami': 'street_fast',
+    'Las Vegas Street Circuit': 'street_fast',
+    'Las Vegas': 'street_fast',
+    'Autodromo Nazionale di Monza': 'high_speed',
+    'Monza': 'high_speed',
+    'Circuit de Spa-Francorchamps': 'high_speed',
+    'Spa-Francorchamps': 'high_speed',
+    'Silverstone Circuit': 'high_speed',
+    'Silverstone': 'high_speed',
+    'Suzuka Circuit': 'high_speed',
+    'Suzuka': 'high_speed',
+    'Red Bull Ring': 'high_speed',
+    'Bahrain International Circuit': 'mixed',
+    'Bahrain': 'mixed',
+    'Circuit of the Americas': 'mixed',
+    'Shanghai International Circuit': 'mixed',
+    'Shanghai': 'mixed',
+    'Albert Park Grand Prix Circuit': 'mixed',
+    'Albert Park': 'mixed',
+    'Losail International Circuit': 'mixed',
+    'Losail': 'mixed',
+    'Yas Marina Circuit': 'mixed',
+    'Yas Marina': 'mixed',
+    'Autodromo Enzo e Dino Ferrari': 'mixed',
+    'Imola': 'mixed',
+    'Circuit Gilles Villeneuve': 'mixed',
+    'Hungaroring': 'mixed',
+    'Circuit Zandvoort': 'mixed',
+    'Zandvoort': 'mixed',
+    'Autódromo José Carlos Pace': 'mixed',
+    'Interlagos': 'mixed',
+    'Autódromo Hermanos Rodríguez': 'mixed',
+    'Mexico City': 'mixed',
+    'Circuit de Barcelona-Catalunya': 'mixed',
+    'Barcelona': 'mixed'
+}.items()})
+
+# ===== FALLBACK DATA (if API fails) =====
+
+# 2025 known driver lineup
+_FALLBACK_DRIVERS = MappingProxyType({
+    'Max Verstappen': 'Red Bull Racing',
+    'Sergio Perez': 'Red Bull Racing',
+    'Oscar Piastri': 'McLaren',
+    'Lando Norris': 'McLaren',
+    'Charles Leclerc': 'Ferrari',
+    'Lewis Hamilton': 'Ferrari',
+    'George Russell': 'Mercedes',
+    'Andrea Kimi Antonelli': 'Mercedes',
+    'Fernando Alonso': 'Aston Martin',
+    'Lance Stroll': 'Aston Martin',
+    'Pierre Gasly': 'Alpine F1 Team',
+    'Jack Doohan': 'Alpine F1 Team',
+    'Alexander Albon': 'Williams',
+    'Carlos Sainz': 'Williams',
+    'Nico Hulkenberg': 'Haas F1 Team',
+    'Esteban Ocon': 'Haas F1 Team',
+    'Yuki Tsunoda': 'RB',
+    'Isack Hadjar': 'RB',
+    'Gabriel Bortoleto': 'Sauber',
+    'Oliver Bearman': 'Sauber'
+})
+
+# Estimated driver skills
+_FALLBACK_DRIVER_SKILLS = MappingProxyType({
+    'Max Verstappen': 98,
+    'Oscar Piastri': 90,
+    'Lando Norris': 92,
+    'Charles Leclerc': 93,
+    'Lewis Hamilton': 96,
+    'George Russell': 88,
+    'Fernando Alonso': 94,
+    'Carlos Sainz': 87,
+    'Sergio Perez': 82,
+    'Alexander Albon': 80,
+    'Pierre Gasly': 81,
+    'Nico Hulkenberg': 79,
+    'Yuki Tsunoda': 77,
+    'Esteban Ocon': 76,
+    'Lance Stroll': 72,
+    'Andrea Kimi Antonelli': 75,
+    'Oliver Bearman': 70,
+    'Isack Hadjar': 71,
+    'Jack Doohan': 68,
+    'Gabriel Bortoleto': 67
+})
+
+# Estimated team performance
+_FALLBACK_TEAM_PERFORMANCE = MappingProxyType({
+    'Red Bull Racing': 95,
+    'McLaren': 92,
+    'Ferrari': 90,
+    'Mercedes': 85,
+    'Aston Martin': 70,
+    'Alpine F1 Team': 65,
+    'Williams': 60,
+    'Haas F1 Team': 55,
+    'RB': 58,
+    'Sauber': 50
+})
+
+# Known 2025 circuits
+_FALLBACK_CIRCUITS = (
+    'Bahrain International Circuit',
+    'Jeddah Corniche Circuit',
+    'Albert Park Circuit',
+    'Suzuka Circuit',
+    'Shanghai International Circuit',
+    'Miami International Autodrome',
+    'Autodromo Enzo e Dino Ferrari',
+    'Circuit de Monaco',
+    'Circuit Gilles Villeneuve',
+    'Circuit de Barcelona-Catalunya',
+    'Red Bull Ring',
+    'Silverstone Circuit',
+    'Hungaroring',
+    'Circuit de Spa-Francorchamps',
+    'Circuit Zandvoort',
+    'Autodromo Nazionale di Monza',
+    'Marina Bay Street Circuit',
+    'Baku City Circuit',
+    'Circuit of the Americas',
+    'Autódromo Hermanos Rodríguez',
+    'Autódromo José Carlos Pace',
+    'Las Vegas Street Circuit',
+    'Losail International Circuit',
+    'Yas Marina Circuit',
+)
+
+
+class _RateLimiter:
+    """Spaces calls at least `interval` seconds apart across threads"""
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+    
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
 
 class F1DataFetcherForML:
     """Fetch real F1 data for ML training"""
@@ -26,44 +207,96 @@ class F1DataFetcherForML:
         self.season = season
         self.base_url = "https://api.jolpi.ca/ergast/f1"
         
-    def get_current_drivers_and_teams(self) -> Dict:
+        # Keep-alive connection pool shared by every API call, with retries
+        # on rate limiting and transient server errors
+        self._session = requests.Session()
+        self._session.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        ))
+        self._session.headers.update({'Accept': 'application/json', 'User-Agent': 'DriveAheadF1/1.0'})
+        
+        # Per-driver lookups run concurrently, capped at ~10 requests/second
+        self._rate_limiter = _RateLimiter(0.1)
+        
+        # On-disk response cache, one directory per season
+        self.cache_dir = os.path.join(CACHE_DIR, str(season))
+        
+        # Assembled training metadata, keyed by season
+        self._metadata_cache: Dict[int, Dict] = {}
+    
+    def close(self):
+        """Release the pooled connections"""
+        self._session.close()
+    
+    def clear_cache(self):
+        """Drop this season's cached API responses"""
+        self.invalidate_metadata()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+    
+    def invalidate_metadata(self):
+        """Forget the assembled metadata so the next call rebuilds it"""
+        self._metadata_cache.pop(self.season, None)
+    
+    def _cached_get(self, url: str, ttl_seconds: int = STANDINGS_TTL,
+                    timeout: Tuple[float, float] = (3, 10), rate_limited: bool = False) -> Dict:
+        """GET a JSON endpoint, served from the disk cache while younger than the TTL"""
+        path = os.path.join(self.cache_dir, hashlib.sha1(url.encode()).hexdigest() + '.json')
+        try:
+            if time.time() - os.path.getmtime(path) < ttl_seconds:
+                with open(path, 'rb') as f:
+                    return _json_loads(f.read())
+        except (OSError, ValueError):
+            pass
+        
+        if rate_limited:
+            self._rate_limiter.wait()
+        response = self._session.get(url, timeout=timeout)
+        response.raise_for_status()
+        data = _json_loads(response.content)
+        
+        # Store the body as received (no re-encoding); write to a temp file
+        # and rename, so readers never see a partial file
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(response.content)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not cache {url}: {e}")
+        
+        return data
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        
+    def get_current_drivers_and_teams(self, driver_standings: Optional[List[Dict]] = None) -> Dict:
         """
         Fetch current season drivers and their teams from F1 API
+        Teams come from the driver standings (one request); the per-driver
+        lookup is only needed before the first standings are published
         Returns: {driver: team, ...}
         """
         try:
             logger.info(f"Fetching {self.season} season driver lineup from API...")
             
-            url = f"{self.base_url}/{self.season}/drivers.json"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
+            if driver_standings is None:
+                driver_standings = self._fetch_driver_standings()
             
-            data = response.json()
-            drivers_data = data['MRData']['DriverTable']['Drivers']
-            
-            # Get constructor info for each driver
             driver_teams = {}
             
-            for driver_info in drivers_data:
-                driver_name = f"{driver_info['givenName']} {driver_info['familyName']}"
-                
-                # Get driver's current team
-                driver_id = driver_info['driverId']
-                team_url = f"{self.base_url}/{self.season}/drivers/{driver_id}/constructors.json"
-                
-                try:
-                    team_response = requests.get(team_url, timeout=5)
-                    team_data = team_response.json()
-                    
-                    constructors = team_data['MRData']['ConstructorTable']['Constructors']
-                    if constructors:
-                        team_name = constructors[0]['name']
-                        driver_teams[driver_name] = team_name
-                    
-                    time.sleep(0.1)  # Rate limiting
-                    
-                except Exception as e:
-                    logger.warning(f"Could not fetch team for {driver_name}: {e}")
+            for standing in driver_standings:
+                if standing.get('Constructors'):
+                    driver_name = f"{standing['Driver']['givenName']} {standing['Driver']['familyName']}"
+                    driver_teams[driver_name] = standing['Constructors'][0]['name']
+            
+            if not driver_teams:
+                driver_teams = self._fetch_drivers_with_constructors()
             
             logger.info(f"Fetched {len(driver_teams)} drivers from API")
             return driver_teams
@@ -73,7 +306,52 @@ class F1DataFetcherForML:
             # Fallback to 2025 grid (current known lineup)
             return self._get_fallback_drivers()
     
-    def calculate_driver_skills(self, driver_teams: Dict[str, str]) -> Dict[str, int]:
+    def _fetch_drivers_with_constructors(self) -> Dict[str, str]:
+        """Driver lineup with one constructor lookup per driver (early season only)"""
+        url = f"{self.base_url}/{self.season}/drivers.json"
+        data = self._cached_get(url)
+        drivers_data = data['MRData']['DriverTable']['Drivers']
+        
+        # Get constructor info for each driver, fetched concurrently
+        driver_names = [f"{d['givenName']} {d['familyName']}" for d in drivers_data]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(self._fetch_constructor, d['driverId']) for d in drivers_data]
+        
+        driver_teams = {}
+        
+        for driver_name, future in zip(driver_names, futures):
+            try:
+                constructors = future.result()
+                if constructors:
+                    team_name = constructors[0]['name']
+                    driver_teams[driver_name] = team_name
+                
+            except Exception as e:
+                logger.warning(f"Could not fetch team for {driver_name}: {e}")
+        
+        return driver_teams
+    
+    def _fetch_constructor(self, driver_id: str) -> List[Dict]:
+        """Fetch a driver's constructors for the season (rate limited)"""
+        team_url = f"{self.base_url}/{self.season}/drivers/{driver_id}/constructors.json"
+        team_data = self._cached_get(team_url, timeout=(3, 5), rate_limited=True)
+        return team_data['MRData']['ConstructorTable']['Constructors']
+    
+    def _fetch_standings_list(self, endpoint: str, key: str) -> List[Dict]:
+        """Fetch a season standings table (empty before the first race)"""
+        url = f"{self.base_url}/{self.season}/{endpoint}.json"
+        data = self._cached_get(url)
+        standings_list = data['MRData']['StandingsTable']['StandingsLists']
+        return standings_list[0][key] if standings_list else []
+    
+    def _fetch_driver_standings(self) -> List[Dict]:
+        return self._fetch_standings_list('driverStandings', 'DriverStandings')
+    
+    def _fetch_constructor_standings(self) -> List[Dict]:
+        return self._fetch_standings_list('constructorStandings', 'ConstructorStandings')
+    
+    def calculate_driver_skills(self, driver_teams: Dict[str, str],
+                                standings: Optional[List[Dict]] = None) -> Dict[str, int]:
         """
         Calculate driver skill ratings based on:
         - Championship standings (points)
@@ -85,37 +363,29 @@ class F1DataFetcherForML:
         try:
             logger.info("Calculating driver skill ratings from championship data...")
             
-            # Get current season standings
-            url = f"{self.base_url}/{self.season}/driverStandings.json"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            standings_list = data['MRData']['StandingsTable']['StandingsLists']
+            # Get current season standings (unless already fetched)
+            if standings is None:
+                standings = self._fetch_driver_standings()
             
             driver_skills = {}
             
-            if standings_list:
-                standings = standings_list[0]['DriverStandings']
+            if standings:
+                points, positions, wins = self._standings_arrays(standings)
                 
                 # Get max points for normalization
-                max_points = max([int(s['points']) for s in standings]) if standings else 1
+                max_points = points.max()
+                
+                # Calculate skill rating (0-100) for all drivers at once
+                # Based on: championship position (40%), points (30%), wins (30%)
+                position_score = (21 - np.minimum(positions, 20)) / 20 * 40  # Higher pos = higher score
+                points_score = (points / max_points) * 30 if max_points > 0 else 0
+                wins_score = np.minimum(wins * 5, 30)  # 5 points per win, max 30
                 
-                for standing in standings:
+                skill_ratings = (position_score + points_score + wins_score + 40).astype(np.int32)  # +40 base
+                skill_ratings = np.clip(skill_ratings, 60, 100)  # Clamp 60-100
+                
+                for standing, skill_rating in zip(standings, skill_ratings.tolist()):
                     driver_name = f"{standing['Driver']['givenName']} {standing['Driver']['familyName']}"
-                    points = int(standing['points'])
-                    position = int(standing['position'])
-                    wins = int(standing['wins'])
-                    
-                    # Calculate skill rating (0-100)
-                    # Based on: championship position (40%), points (30%), wins (30%)
-                    position_score = (21 - min(position, 20)) / 20 * 40  # Higher pos = higher score
-                    points_score = (points / max_points) * 30 if max_points > 0 else 0
-                    wins_score = min(wins * 5, 30)  # 5 points per win, max 30
-                    
-                    skill_rating = int(position_score + points_score + wins_score + 40)  # +40 base
-                    skill_rating = min(100, max(60, skill_rating))  # Clamp 60-100
-                    
                     driver_skills[driver_name] = skill_rating
             
             # For drivers not in standings (rookies, etc), use base rating
@@ -131,7 +401,17 @@ class F1DataFetcherForML:
             # Fallback to estimated ratings
             return self._get_fallback_driver_skills()
     
-    def calculate_team_performance(self, driver_teams: Dict[str, str]) -> Dict[str, int]:
+    @staticmethod
+    def _standings_arrays(standings: List[Dict]):
+        """Points, positions and wins of a standings table as int arrays"""
+        count = len(standings)
+        points = np.fromiter((int(s['points']) for s in standings), dtype=np.int32, count=count)
+        positions = np.fromiter((int(s['position']) for s in standings), dtype=np.int32, count=count)
+        wins = np.fromiter((int(s['wins']) for s in standings), dtype=np.int32, count=count)
+        return points, positions, wins
+    
+    def calculate_team_performance(self, driver_teams: Dict[str, str],
+                                   standings: Optional[List[Dict]] = None) -> Dict[str, int]:
         """
         Calculate team performance ratings based on constructor championship
         
@@ -140,36 +420,27 @@ class F1DataFetcherForML:
         try:
             logger.info("Calculating team performance from constructor standings...")
             
-            url = f"{self.base_url}/{self.season}/constructorStandings.json"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            standings_list = data['MRData']['StandingsTable']['StandingsLists']
+            if standings is None:
+                standings = self._fetch_constructor_standings()
             
             team_performance = {}
             
-            if standings_list:
-                standings = standings_list[0]['ConstructorStandings']
+            if standings:
+                points, positions, wins = self._standings_arrays(standings)
                 
                 # Get max points
-                max_points = max([int(s['points']) for s in standings]) if standings else 1
+                max_points = points.max()
+                
+                # Calculate performance (0-100) for all teams at once
+                position_score = (11 - np.minimum(positions, 10)) / 10 * 40
+                points_score = (points / max_points) * 40 if max_points > 0 else 0
+                wins_score = np.minimum(wins * 2, 20)
                 
-                for standing in standings:
-                    team_name = standing['Constructor']['name']
-                    points = int(standing['points'])
-                    position = int(standing['position'])
-                    wins = int(standing['wins'])
-                    
-                    # Calculate performance (0-100)
-                    position_score = (11 - min(position, 10)) / 10 * 40
-                    points_score = (points / max_points) * 40 if max_points > 0 else 0
-                    wins_score = min(wins * 2, 20)
-                    
-                    performance = int(position_score + points_score + wins_score)
-                    performance = min(100, max(40, performance))
-                    
-                    team_performance[team_name] = performance
+                performances = (position_score + points_score + wins_score).astype(np.int32)
+                performances = np.clip(performances, 40, 100)
+                
+                for standing, performance in zip(standings, performances.tolist()):
+                    team_performance[standing['Constructor']['name']] = performance
             
             logger.info(f"Calculated performance for {len(team_performance)} teams")
             return team_performance
@@ -188,10 +459,7 @@ class F1DataFetcherForML:
             logger.info(f"Fetching {self.season} season circuits from API...")
             
             url = f"{self.base_url}/{self.season}/circuits.json"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._cached_get(url, ttl_seconds=CIRCUITS_TTL)
             circuits_data = data['MRData']['CircuitTable']['Circuits']
             
             circuits = [circuit['circuitName'] for circuit in circuits_data]
@@ -203,20 +471,29 @@ class F1DataFetcherForML:
             logger.error(f"Error fetching circuits: {e}")
             return self._get_fallback_circuits()
     
-    def get_all_training_metadata(self) -> Dict:
+    def get_all_training_metadata(self, force_refresh: bool = False) -> Dict:
         """
         Fetch all necessary data for ML training
         
+        Args:
+            force_refresh: Ignore cached API responses and refetch everything
+        
         Returns: Complete metadata dict with drivers, teams, skills, circuits
         """
+        if force_refresh:
+            self.clear_cache()
+        elif self.season in self._metadata_cache:
+            return self._metadata_cache[self.season]
+        
         logger.info("=" * 60)
         logger.info(f"FETCHING REAL-TIME F1 DATA FOR {self.season} SEASON")
         logger.info("=" * 60)
         
-        # Fetch all data
-        driver_teams = self.get_current_drivers_and_teams()
-        driver_skills = self.calculate_driver_skills(driver_teams)
-        team_performance = self.calculate_team_performance(driver_teams)
+        # Fetch all data (each standings table is requested once)
+        driver_standings, constructor_standings = self._fetch_standings_once()
+        driver_teams = self.get_current_drivers_and_teams(driver_standings)
+        driver_skills = self.calculate_driver_skills(driver_teams, driver_standings)
+        team_performance = self.calculate_team_performance(driver_teams, constructor_standings)
         circuits = self.get_circuits()
         
         metadata = {
@@ -235,161 +512,61 @@ class F1DataFetcherForML:
         logger.info(f"  Teams: {len(set(driver_teams.values()))}")
         logger.info(f"  Circuits: {len(circuits)}")
         
+        self._metadata_cache[self.season] = metadata
         return metadata
     
-    def _get_circuit_types(self) -> Dict[str, str]:
+    def _fetch_standings_once(self):
+        """
+        Driver and constructor standings for the season, one request each
+        A table that fails to load is None, so its consumer retries and
+        falls back on its own
+        """
+        try:
+            driver_standings = self._fetch_driver_standings()
+        except Exception as e:
+            logger.error(f"Error fetching driver standings: {e}")
+            driver_standings = None
+        
+        try:
+            constructor_standings = self._fetch_constructor_standings()
+        except Exception as e:
+            logger.error(f"Error fetching constructor standings: {e}")
+            constructor_standings = None
+        
+        return driver_standings, constructor_standings
+    
+    def _get_circuit_types(self) -> Mapping[str, str]:
         """
         Circuit type classification (static - based on track characteristics)
-        This doesn't change, so it's OK to keep as a dict
+        Shared read-only table keyed by lowercased circuit name
         """
-        return {
-            'Circuit de Monaco': 'street',
-            'Monaco': 'street',
-            'Marina Bay Street Circuit': 'street',
-            'Singapore': 'street',
-            'Baku City Circuit': 'street',
-            'Baku': 'street',
-            'Jeddah Corniche Circuit': 'street_fast',
-            'Jeddah': 'street_fast',
-            'Miami International Autodrome': 'street_fast',
-            'Miami': 'street_fast',
-            'Las Vegas Street Circuit': 'street_fast',
-            'Las Vegas': 'street_fast',
-            'Autodromo Nazionale di Monza': 'high_speed',
-            'Monza': 'high_speed',
-            'Circuit de Spa-Francorchamps': 'high_speed',
-            'Spa-Francorchamps': 'high_speed',
-            'Silverstone Circuit': 'high_speed',
-            'Silverstone': 'high_speed',
-            'Suzuka Circuit': 'high_speed',
-            'Suzuka': 'high_speed',
-            'Red Bull Ring': 'high_speed',
-            'Bahrain International Circuit': 'mixed',
-            'Bahrain': 'mixed',
-            'Circuit of the Americas': 'mixed',
-            'Shanghai International Circuit': 'mixed',
-            'Shanghai': 'mixed',
-            'Albert Park Grand Prix Circuit': 'mixed',
-            'Albert Park': 'mixed',
-            'Losail International Circuit': 'mixed',
-            'Losail': 'mixed',
-            'Yas Marina Circuit': 'mixed',
-            'Yas Marina': 'mixed',
-            'Autodromo Enzo e Dino Ferrari': 'mixed',
-            'Imola': 'mixed',
-            'Circuit Gilles Villeneuve': 'mixed',
-            'Hungaroring': 'mixed',
-            'Circuit Zandvoort': 'mixed',
-            'Zandvoort': 'mixed',
-            'Autódromo José Carlos Pace': 'mixed',
-            'Interlagos': 'mixed',
-            'Autódromo Hermanos Rodríguez': 'mixed',
-            'Mexico City': 'mixed',
-            'Circuit de Barcelona-Catalunya': 'mixed',
-            'Barcelona': 'mixed'
-        }
+        return _CIRCUIT_TYPES
     
     # ===== FALLBACK METHODS (if API fails) =====
     
-    def _get_fallback_drivers(self) -> Dict[str, str]:
+    def _get_fallback_drivers(self) -> Mapping[str, str]:
         """Fallback: 2025 known driver lineup"""
-        return {
-            'Max Verstappen': 'Red Bull Racing',
-            'Sergio Perez': 'Red Bull Racing',
-            'Oscar Piastri': 'McLaren',
-            'Lando Norris': 'McLaren',
-            'Charles Leclerc': 'Ferrari',
-            'Lewis Hamilton': 'Ferrari',
-            'George Russell': 'Mercedes',
-            'Andrea Kimi Antonelli': 'Mercedes',
-            'Fernando Alonso': 'Aston Martin',
-            'Lance Stroll': 'Aston Martin',
-            'Pierre Gasly': 'Alpine F1 Team',
-            'Jack Doohan': 'Alpine F1 Team',
-            'Alexander Albon': 'Williams',
-            'Carlos Sainz': 'Williams',
-            'Nico Hulkenberg': 'Haas F1 Team',
-            'Esteban Ocon': 'Haas F1 Team',
-            'Yuki Tsunoda': 'RB',
-            'Isack Hadjar': 'RB',
-            'Gabriel Bortoleto': 'Sauber',
-            'Oliver Bearman': 'Sauber'
-        }
+        return _FALLBACK_DRIVERS
     
-    def _get_fallback_driver_skills(self) -> Dict[str, int]:
+    def _get_fallback_driver_skills(self) -> Mapping[str, int]:
         """Fallback: Estimated driver skills"""
-        return {
-            'Max Verstappen': 98,
-            'Oscar Piastri': 90,
-            'Lando Norris': 92,
-            'Charles Leclerc': 93,
-            'Lewis Hamilton': 96,
-            'George Russell': 88,
-            'Fernando Alonso': 94,
-            'Carlos Sainz': 87,
-            'Sergio Perez': 82,
-            'Alexander Albon': 80,
-            'Pierre Gasly': 81,
-            'Nico Hulkenberg': 79,
-            'Yuki Tsunoda': 77,
-            'Esteban Ocon': 76,
-            'Lance Stroll': 72,
-            'Andrea Kimi Antonelli': 75,
-            'Oliver Bearman': 70,
-            'Isack Hadjar': 71,
-            'Jack Doohan': 68,
-            'Gabriel Bortoleto': 67
-        }
+        return _FALLBACK_DRIVER_SKILLS
     
-    def _get_fallback_team_performance(self) -> Dict[str, int]:
+    def _get_fallback_team_performance(self) -> Mapping[str, int]:
         """Fallback: Estimated team performance"""
-        return {
-            'Red Bull Racing': 95,
-            'McLaren': 92,
-            'Ferrari': 90,
-            'Mercedes': 85,
-            'Aston Martin': 70,
-            'Alpine F1 Team': 65,
-            'Williams': 60,
-            'Haas F1 Team': 55,
-            'RB': 58,
-            'Sauber': 50
-        }
+        return _FALLBACK_TEAM_PERFORMANCE
     
-    def _get_fallback_circuits(self) -> List[str]:
+    def _get_fallback_circuits(self) -> Sequence[str]:
         """Fallback: Known 2025 circuits"""
-        return [
-            'Bahrain International Circuit',
-            'Jeddah Corniche Circuit',
-            'Albert Park Circuit',
-            'Suzuka Circuit',
-            'Shanghai International Circuit',
-            'Miami International Autodrome',
-            'Autodromo Enzo e Dino Ferrari',
-            'Circuit de Monaco',
-            'Circuit Gilles Villeneuve',
-            'Circuit de Barcelona-Catalunya',
-            'Red Bull Ring',
-            'Silverstone Circuit',
-            'Hungaroring',
-            'Circuit de Spa-Francorchamps',
-            'Circuit Zandvoort',
-            'Autodromo Nazionale di Monza',
-            'Marina Bay Street Circuit',
-            'Baku City Circuit',
-            'Circuit of the Americas',
-            'Autódromo Hermanos Rodríguez',
-            'Autódromo José Carlos Pace',
-            'Las Vegas Street Circuit',
-            'Losail International Circuit',
-            'Yas Marina Circuit'
-        ]
+        return _FALLBACK_CIRCUITS
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    
     # Test the data fetcher
-    fetcher = F1DataFetcherForML(season=2025)
-    metadata = fetcher.get_all_training_metadata()
+    with F1DataFetcherForML(season=2025) as fetcher:
+        metadata = fetcher.get_all_training_metadata()
     
     print("\n" + "=" * 60)
     print("SAMPLE DATA FETCHED:")
@@ -6,109 +6,219 @@ Provides real-time track maps, driver positions, and comprehensive telemetry dat
 import requests
 import json
 import random
+import re
 import math
+import numpy as np
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
+try:
+    import orjson
+except ImportError:  # orjson is optional, stdlib json parses the same payloads
+    orjson = None
+
+# Decodes a JSON body (bytes) with orjson when available
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Circuit name fragment -> MultiViewer API circuit key
+CIRCUIT_KEYS = {
+    "bahrain": 3,
+    "jeddah": 15,
+    "albert park": 1,
+    "melbourne": 1,
+    "suzuka": 22,
+    "shanghai": 17,
+    "miami": 78,
+    "imola": 14,
+    "monaco": 6,
+    "montreal": 7,
+    "barcelona": 4,
+    "red bull ring": 70,
+    "silverstone": 9,
+    "hungaroring": 11,
+    "spa": 12,
+    "zandvoort": 39,
+    "monza": 13,
+    "marina bay": 15,
+    "singapore": 15,
+    "baku": 73,
+    "austin": 69,
+    "mexico city": 32,
+    "interlagos": 18,
+    "las vegas": 79,
+    "losail": 25,
+    "yas marina": 24,
+    "abu dhabi": 24
+}
+
+# Track geometry changes at most once a season
+TRACK_MAP_CACHE_DIR = 'backend/.cache/track_maps'
+TRACK_MAP_CACHE_SIZE = 8
+TRACK_MAP_TTL = 30 * 24 * 3600
+
+# Fragment -> (listing order, circuit key); earlier fragments win
+_CIRCUIT_KEY_ORDER = {name: (order, key) for order, (name, key) in enumerate(CIRCUIT_KEYS.items())}
+_CIRCUIT_KEY_PATTERN = re.compile('(?=(' + '|'.join(re.escape(name) for name in CIRCUIT_KEYS) + '))')
+
+
+
+def _build_spacing(num_drivers: int) -> np.ndarray:
+    """Gap behind the leader per grid slot (leaders more spread, midfield clustered)"""
+    i = np.arange(num_drivers)
+    return np.where(i < 5, i * 50,                              # Top 5 - more spread
+                    np.where(i < 15, 250 + (i - 5) * 20,        # Midfield - clustered
+                             450 + (i - 15) * 40))              # Back markers
+
+
+_GRID_SPACING = _build_spacing(20)
+_GRID_SPACING.flags.writeable = False
+_DRS_CHOICES = np.array([0, 0, 0, 1, 2])  # 0=off, 1=available, 2=active (weighted)
+
+# Drivers shown on the sector timing board
+_SECTOR_DRIVERS = (
+    {'number': 1, 'name': 'VER', 'team_color': '3671C6'},
+    {'number': 11, 'name': 'PER', 'team_color': '3671C6'},
+    {'number': 44, 'name': 'HAM', 'team_color': '27F4D2'},
+    {'number': 63, 'name': 'RUS', 'team_color': '27F4D2'},
+    {'number': 16, 'name': 'LEC', 'team_color': 'E8002D'},
+    {'number': 55, 'name': 'SAI', 'team_color': 'E8002D'},
+    {'number': 4, 'name': 'NOR', 'team_color': 'FF8000'},
+    {'number': 81, 'name': 'PIA', 'team_color': 'FF8000'},
+    {'number': 14, 'name': 'ALO', 'team_color': '229971'},
+    {'number': 18, 'name': 'STR', 'team_color': '229971'},
+)
+
+
 class TelemetryEngine:
     def __init__(self):
         self.multiviewer_api = "https://api.multiviewer.app/api/v1"
-        self.cached_track_map = None
-        self.cached_circuit_key = None
+        
+        # Recently used track maps keyed by (circuit_key, year), least recent first
+        self._track_map_cache: "OrderedDict[Tuple[int, int], Dict]" = OrderedDict()
+        self._track_map_lock = threading.Lock()
+        
+        # Keep-alive connection pool for the MultiViewer API
+        self._session = requests.Session()
+        
+        # Batched random draws for the simulated telemetry
+        self._rng = np.random.default_rng()
         
     def get_circuit_key_from_name(self, circuit_name: str) -> Optional[int]:
         """Map circuit names to MultiViewer API circuit keys"""
-        circuit_map = {
-            "bahrain": 3,
-            "jeddah": 15,
-            "albert park": 1,
-            "melbourne": 1,
-            "suzuka": 22,
-            "shanghai": 17,
-            "miami": 78,
-            "imola": 14,
-            "monaco": 6,
-            "montreal": 7,
-            "barcelona": 4,
-            "red bull ring": 70,
-            "silverstone": 9,
-            "hungaroring": 11,
-            "spa": 12,
-            "zandvoort": 39,
-            "monza": 13,
-            "marina bay": 15,
-            "singapore": 15,
-            "baku": 73,
-            "austin": 69,
-            "mexico city": 32,
-            "interlagos": 18,
-            "las vegas": 79,
-            "losail": 25,
-            "yas marina": 24,
-            "abu dhabi": 24
-        }
-        
-        for key, value in circuit_map.items():
-            if key in circuit_name.lower():
-                return value
+        # One regex pass; the lookahead yields the earliest-listed key
+        # starting at each position, so the lowest listing order among the
+        # matches is the first key (in map order) found in the name
+        matches = [_CIRCUIT_KEY_ORDER[m.group(1)] for m in _CIRCUIT_KEY_PATTERN.finditer(circuit_name.lower())]
+        if matches:
+            return min(matches)[1]
         return 1  # Default to Melbourne
     
     def fetch_track_map(self, circuit_key: int) -> Optional[Dict]:
+        """Fetch track map data, from the in-memory LRU or disk cache when possible"""
+        year = datetime.now().year
+        cache_key = (circuit_key, year)
+        
+        with self._track_map_lock:
+            track_map = self._track_map_cache.get(cache_key)
+            if track_map is not None:
+                self._track_map_cache.move_to_end(cache_key)
+                return track_map
+        
+        path = os.path.join(TRACK_MAP_CACHE_DIR, f"track_{circuit_key}_{year}.json")
+        track_map = self._read_cached_track_map(path)
+        if track_map is None:
+            track_map = self._fetch_track_map_from_api(circuit_key, year)
+            if track_map is None:
+                return None
+            self._write_cached_track_map(path, track_map)
+        
+        with self._track_map_lock:
+            self._track_map_cache[cache_key] = track_map
+            self._track_map_cache.move_to_end(cache_key)
+            while len(self._track_map_cache) > TRACK_MAP_CACHE_SIZE:
+                self._track_map_cache.popitem(last=False)
+        
+        return track_map
+    
+    def _fetch_track_map_from_api(self, circuit_key: int, year: int) -> Optional[Dict]:
         """Fetch track map data from MultiViewer API"""
         try:
-            year = datetime.now().year
-            response = requests.get(
+            response = self._session.get(
                 f"{self.multiviewer_api}/circuits/{circuit_key}/{year}",
-                timeout=5
+                timeout=(3, 5)
             )
             
             if response.status_code == 200:
-                return response.json()
+                return _json_loads(response.content)
             else:
                 # Fallback to previous year if current year not available
-                response = requests.get(
+                response = self._session.get(
                     f"{self.multiviewer_api}/circuits/{circuit_key}/{year-1}",
-                    timeout=5
+                    timeout=(3, 5)
                 )
                 if response.status_code == 200:
-                    return response.json()
+                    return _json_loads(response.content)
                     
         except Exception as e:
             print(f"Error fetching track map: {e}")
         
         return None
     
-    def generate_realistic_track_positions(self, num_drivers: int = 20, lap_progress: float = 0.0) -> List[Dict]:
-        """Generate realistic driver positions on track"""
-        positions = []
+    def _read_cached_track_map(self, path: str) -> Optional[Dict]:
+        """Track map from disk if it is younger than the TTL"""
+        try:
+            if time.time() - os.path.getmtime(path) < TRACK_MAP_TTL:
+                with open(path, 'rb') as f:
+                    return _json_loads(f.read())
+        except (OSError, ValueError):
+            pass
+        return None
+    
+    def _write_cached_track_map(self, path: str, track_map: Dict):
+        """Write atomically (temp file + rename) so readers never see a partial file"""
+        try:
+            os.makedirs(TRACK_MAP_CACHE_DIR, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=TRACK_MAP_CACHE_DIR, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(track_map, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error caching track map: {e}")
+    
+    def generate_realistic_track_positions_soa(self, num_drivers: int = 20,
+                                               lap_progress: float = 0.0) -> Dict[str, np.ndarray]:
+        """Generate realistic driver positions on track, one array per field"""
+        rng = self._rng
         
-        # Create spread of drivers based on lap progress
-        for i in range(num_drivers):
-            # Calculate position along track (0-1000)
-            base_position = (lap_progress * 1000) % 1000
-            
-            # Add spacing between drivers (leaders more spread, midfield clustered)
-            if i < 5:  # Top 5 - more spread
-                spacing = i * 50
-            elif i < 15:  # Midfield - clustered
-                spacing = 250 + (i - 5) * 20
-            else:  # Back markers
-                spacing = 450 + (i - 15) * 40
-            
-            track_pos = (base_position + spacing) % 1000
-            
-            positions.append({
-                'driver_number': i + 1,
-                'track_position': track_pos,
-                'speed': 250 + random.randint(-30, 30),  # km/h
-                'throttle': 85 + random.randint(-15, 15),  # %
-                'brake': random.choice([0, 0, 0, random.randint(20, 100)]),  # %
-                'gear': random.randint(5, 8),
-                'rpm': 10000 + random.randint(-2000, 2000),
-                'drs': random.choice([0, 0, 0, 1, 2]),  # 0=off, 1=available, 2=active
-            })
+        # Calculate position along track (0-1000)
+        base_position = (lap_progress * 1000) % 1000
+        
+        # Add spacing between drivers (precomputed for a full grid)
+        spacing = _GRID_SPACING if num_drivers == len(_GRID_SPACING) else _build_spacing(num_drivers)
         
-        return positions
+        # One draw per field for the whole grid
+        return {
+            'driver_number': np.arange(1, num_drivers + 1),
+            'track_position': (base_position + spacing) % 1000,
+            'speed': 250 + rng.integers(-30, 31, num_drivers),  # km/h
+            'throttle': 85 + rng.integers(-15, 16, num_drivers),  # %
+            'brake': np.where(rng.random(num_drivers) < 0.25, rng.integers(20, 101, num_drivers), 0),  # %
+            'gear': rng.integers(5, 9, num_drivers),
+            'rpm': 10000 + rng.integers(-2000, 2001, num_drivers),
+            'drs': rng.choice(_DRS_CHOICES, num_drivers),  # 0=off, 1=available, 2=active
+        }
+    
+    def generate_realistic_track_positions(self, num_drivers: int = 20, lap_progress: float = 0.0) -> List[Dict]:
+        """Generate realistic driver positions on track"""
+        columns = {name: values.tolist()
+                   for name, values in self.generate_realistic_track_positions_soa(num_drivers, lap_progress).items()}
+        names = tuple(columns)
+        return [dict(zip(names, row)) for row in zip(*columns.values())]
     
     def get_track_visualization_data(self, circuit_name: str = "Melbourne") -> Dict:
         """Get comprehensive track visualization data"""
@@ -116,11 +226,7 @@ class TelemetryEngine:
         circuit_key = self.get_circuit_key_from_name(circuit_name)
         
         # Fetch or use cached track map
-        if self.cached_circuit_key != circuit_key:
-            track_map = self.fetch_track_map(circuit_key)
-            if track_map:
-                self.cached_track_map = track_map
-                self.cached_circuit_key = circuit_key
+        track_map = self.fetch_track_map(circuit_key)
         
         # Generate driver positions
         lap_progress = (datetime.now().timestamp() % 120) / 120  # 2 min lap cycle
@@ -129,7 +235,7 @@ class TelemetryEngine:
         result = {
             'circuit_name': circuit_name,
             'circuit_key': circuit_key,
-            'track_map': self.cached_track_map,
+            'track_map': track_map,
             'driver_positions': driver_positions,
             'track_status': self.get_track_status(),
             'weather': self.get_weather_data(),
@@ -171,57 +277,54 @@ class TelemetryEngine:
     
     def get_driver_telemetry(self, driver_number: int) -> Dict:
         """Get detailed telemetry for a specific driver"""
+        rng = self._rng
+        
+        # Batched draws: tire corners FL/FR/RL/RR, lap times current/last/best
+        tire_temp = (np.array([95, 95, 100, 100]) + rng.integers(-10, 11, 4)).tolist()
+        tire_wear = rng.integers(5, 46, 4).tolist()
+        lap_secs = rng.integers([20, 20, 18], [36, 36, 26]).tolist()
+        lap_ms = rng.integers(100, 1000, 3).tolist()
+        gap_secs = rng.integers([0, 0], [61, 6]).tolist()  # to leader, ahead
+        gap_tenths = rng.integers(0, 10, 2).tolist()
+        
         return {
             'driver_number': driver_number,
-            'speed': 280 + random.randint(-40, 40),
-            'throttle': 90 + random.randint(-20, 10),
-            'brake': random.choice([0, 0, 0, random.randint(30, 100)]),
-            'steering': random.randint(-180, 180),
-            'gear': random.randint(5, 8),
-            'rpm': 11000 + random.randint(-2000, 1000),
-            'drs': random.choice([0, 0, 1, 2]),
-            'ers_deploy': random.randint(0, 100),
-            'tire_temp': {
-                'FL': 95 + random.randint(-10, 10),
-                'FR': 95 + random.randint(-10, 10),
-                'RL': 100 + random.randint(-10, 10),
-                'RR': 100 + random.randint(-10, 10)
-            },
-            'tire_wear': {
-                'FL': random.randint(5, 45),
-                'FR': random.randint(5, 45),
-                'RL': random.randint(5, 45),
-                'RR': random.randint(5, 45)
-            },
-            'tire_compound': random.choice(['SOFT', 'MEDIUM', 'HARD']),
-            'lap_time': f"1:{random.randint(20, 35)}.{random.randint(100, 999)}",
-            'last_lap_time': f"1:{random.randint(20, 35)}.{random.randint(100, 999)}",
-            'best_lap_time': f"1:{random.randint(18, 25)}.{random.randint(100, 999)}",
-            'position': random.randint(1, 20),
-            'gap_to_leader': f"+{random.randint(0, 60)}.{random.randint(0, 9)}s",
-            'gap_ahead': f"+{random.randint(0, 5)}.{random.randint(0, 9)}s"
+            'speed': 280 + int(rng.integers(-40, 41)),
+            'throttle': 90 + int(rng.integers(-20, 11)),
+            'brake': int(rng.integers(30, 101)) if rng.random() < 0.25 else 0,
+            'steering': int(rng.integers(-180, 181)),
+            'gear': int(rng.integers(5, 9)),
+            'rpm': 11000 + int(rng.integers(-2000, 1001)),
+            'drs': int(rng.choice([0, 0, 1, 2])),
+            'ers_deploy': int(rng.integers(0, 101)),
+            'tire_temp': dict(zip(('FL', 'FR', 'RL', 'RR'), tire_temp)),
+            'tire_wear': dict(zip(('FL', 'FR', 'RL', 'RR'), tire_wear)),
+            'tire_compound': str(rng.choice(['SOFT', 'MEDIUM', 'HARD'])),
+            'lap_time': '1:%d.%d' % (lap_secs[0], lap_ms[0]),
+            'last_lap_time': '1:%d.%d' % (lap_secs[1], lap_ms[1]),
+            'best_lap_time': '1:%d.%d' % (lap_secs[2], lap_ms[2]),
+            'position': int(rng.integers(1, 21)),
+            'gap_to_leader': '+%d.%ds' % (gap_secs[0], gap_tenths[0]),
+            'gap_ahead': '+%d.%ds' % (gap_secs[1], gap_tenths[1])
         }
     
     def get_sector_times(self) -> List[Dict]:
         """Get sector timing for all drivers"""
-        drivers = [
-            {'number': 1, 'name': 'VER', 'team_color': '3671C6'},
-            {'number': 11, 'name': 'PER', 'team_color': '3671C6'},
-            {'number': 44, 'name': 'HAM', 'team_color': '27F4D2'},
-            {'number': 63, 'name': 'RUS', 'team_color': '27F4D2'},
-            {'number': 16, 'name': 'LEC', 'team_color': 'E8002D'},
-            {'number': 55, 'name': 'SAI', 'team_color': 'E8002D'},
-            {'number': 4, 'name': 'NOR', 'team_color': 'FF8000'},
-            {'number': 81, 'name': 'PIA', 'team_color': 'FF8000'},
-            {'number': 14, 'name': 'ALO', 'team_color': '229971'},
-            {'number': 18, 'name': 'STR', 'team_color': '229971'},
-        ]
+        drivers = _SECTOR_DRIVERS
+        
+        # One draw per field for all drivers
+        rng = self._rng
+        n = len(drivers)
+        s1_times = (20.0 + rng.uniform(-0.5, 0.5, n)).tolist()
+        s2_times = (28.0 + rng.uniform(-0.7, 0.7, n)).tolist()
+        s3_times = (22.0 + rng.uniform(-0.4, 0.4, n)).tolist()
+        statuses = rng.choice(['fastest', 'personal_best', 'normal', 'normal'], (n, 3)).tolist()
+        lap_ms = rng.integers(100, 1000, n).tolist()
+        drs = rng.choice([False, False, True], n).tolist()
         
         sector_data = []
         for i, driver in enumerate(drivers):
-            s1_time = 20.0 + random.uniform(-0.5, 0.5)
-            s2_time = 28.0 + random.uniform(-0.7, 0.7)
-            s3_time = 22.0 + random.uniform(-0.4, 0.4)
+            s1_time, s2_time, s3_time = s1_times[i], s2_times[i], s3_times[i]
             
             sector_data.append({
                 'position': i + 1,
@@ -229,20 +332,20 @@ class TelemetryEngine:
                 'driver_name': driver['name'],
                 'team_color': driver['team_color'],
                 'sector1': {
-                    'time': f"{s1_time:.3f}",
-                    'status': random.choice(['fastest', 'personal_best', 'normal', 'normal'])
+                    'time': '%.3f' % s1_time,
+                    'status': statuses[i][0]
                 },
                 'sector2': {
-                    'time': f"{s2_time:.3f}",
-                    'status': random.choice(['fastest', 'personal_best', 'normal', 'normal'])
+                    'time': '%.3f' % s2_time,
+                    'status': statuses[i][1]
                 },
                 'sector3': {
-                    'time': f"{s3_time:.3f}",
-                    'status': random.choice(['fastest', 'personal_best', 'normal', 'normal'])
+                    'time': '%.3f' % s3_time,
+                    'status': statuses[i][2]
                 },
-                'last_lap': f"1:{int(s1_time + s2_time + s3_time)}.{random.randint(100, 999)}",
-                'gap': f"+{i * 0.5:.3f}" if i > 0 else "Leader",
-                'drs': random.choice([False, False, True]),
+                'last_lap': '1:%d.%d' % (s1_time + s2_time + s3_time, lap_ms[i]),
+                'gap': '+%.3f' % (i * 0.5) if i > 0 else "Leader",
+                'drs': drs[i],
                 'pit_stop': i == 5  # One driver pitting
             })
         
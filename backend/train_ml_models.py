@@ -5,9 +5,9 @@ Trains ML models on historical F1 data to predict race winners and positions.
 All data is fetched from the F1 API in real-time - no hardcoded values.
 
 Models trained:
-- Winner Prediction (Classification): RandomForest, XGBoost, Logistic Regression
-- Podium Prediction (Classification): RandomForest, XGBoost, Logistic Regression  
-- Position Prediction (Regression): RandomForest, XGBoost, Linear Regression
+- Winner Prediction (Classification): RandomForest, XGBoost, HistGradientBoosting, Logistic Regression
+- Podium Prediction (Classification): RandomForest, XGBoost, HistGradientBoosting, Logistic Regression  
+- Position Prediction (Regression): RandomForest, XGBoost, HistGradientBoosting, Linear Regression
 
 Features used:
 - Qualifying position
@@ -20,22 +20,281 @@ Features used:
 
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split, cross_val_score
-from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+
+from sklearn.model_selection import train_test_split
+from sklearn.ensemble import (RandomForestClassifier, RandomForestRegressor,
+                              HistGradientBoostingClassifier, HistGradientBoostingRegressor)
 from sklearn.linear_model import LogisticRegression, LinearRegression
-from sklearn.preprocessing import StandardScaler, LabelEncoder
+from sklearn.preprocessing import StandardScaler
+from sklearn.pipeline import make_pipeline
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, mean_absolute_error
 import xgboost as xgb
 import joblib
+from joblib import Memory, Parallel, delayed
 import json
 from datetime import datetime
 import os
 import logging
 from realtime_training_data import F1DataFetcherForML
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional, the NumPy kernel works without it
+    njit = None
+
+try:
+    import pyarrow
+except ImportError:  # pyarrow is optional, the training data dump falls back to CSV
+    pyarrow = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, stdlib json writes the same metadata
+    orjson = None
+
+try:
+    from sklearnex import ensemble as dal_ensemble, linear_model as dal_linear_model
+except ImportError:  # sklearnex is optional, stock scikit-learn trains the same models
+    dal_ensemble = dal_linear_model = None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Candidate models fitted at once on threads (their fits release the GIL)
+PARALLEL_FITS = 3
+
+# Threads per RandomForest/XGBoost fit, sharing the cores between the
+# concurrent fits; past ~8 threads the small training set only adds contention
+MODEL_NJOBS = max(1, min(8, (os.cpu_count() or 1) // PARALLEL_FITS))
+
+# Opt-in (USE_SKLEARNEX=1): fit the RandomForest/linear candidates with
+# sklearnex's oneDAL-accelerated estimators. The best models are refitted
+# with stock scikit-learn before saving, so the server can load them
+# without sklearnex installed.
+USE_SKLEARNEX = dal_ensemble is not None and os.environ.get('USE_SKLEARNEX') == '1'
+
+# Candidates that have a sklearnex counterpart
+DAL_MODELS = {'random_forest', 'logistic', 'linear'}
+
+# On-disk cache for generated training sets, so retrains on unchanged
+# season data skip the generation step. The directory is safe to delete;
+# it is rebuilt on the next training run.
+_memory = Memory('backend/.cache/training_data', verbose=0)
+
+# Part of the training-data cache key. Bump it whenever the generator
+# changes without its arguments changing (_generate_training_data,
+# _midfield_finish, _draw_offsets or the offset/CDF tables below), or
+# stale datasets will keep being served from the cache.
+TRAINING_DATA_VERSION = 1
+
+# Compression for the saved model pickles; joblib.load detects it on its
+# own. zlib is stdlib, so the server can always read them back
+MODEL_COMPRESSION = ('zlib', 3)
+
+# Finishing-position offsets for pole sitters and the rest of the front
+# rows, with their cumulative probabilities (drawn by inverse CDF)
+POLE_OFFSETS = np.array([0, 0, 1, 2])
+POLE_CDF = np.cumsum([0.5, 0.3, 0.15, 0.05])
+FRONT_OFFSETS = np.array([-1, 0, 1, 2])
+FRONT_CDF = np.cumsum([0.2, 0.4, 0.3, 0.1])
+
+
+def _draw_offsets(rng, offsets, cdf, size):
+    """Sample `size` offsets with the probabilities encoded by `cdf`"""
+    return offsets[np.searchsorted(cdf / cdf[-1], rng.random(size), side='right')]
+
+
+def _midfield_finish(quali_position, position_noise, skill, team_performance):
+    """Finishing position from grid slot, luck, driver skill and team strength"""
+    skill_factor = (skill - 70) / 10  # -3 to +2.8
+    team_factor = (team_performance - 50) / 20  # -2.5 to +2.5
+    return np.clip(quali_position + position_noise - skill_factor - team_factor, 1, 20).astype(np.int64)
+
+
+if njit is not None:
+    # parallel=True fuses the array expression into one multi-threaded loop
+    _midfield_finish = njit(cache=True, parallel=True)(_midfield_finish)
+
+
+def _fit_predict(model, X_train, y_train, X_test):
+    """
+    Fit `model` in place and return its predictions for `X_test`. Models
+    with early stopping validate on 10% of the training rows, so the test
+    rows stay unseen until evaluation.
+    """
+    if getattr(model, 'early_stopping_rounds', None):
+        fit_rows, val_rows = train_test_split(np.arange(len(X_train)), test_size=0.1, random_state=42)
+        y_train = np.asarray(y_train)
+        model.fit(X_train[fit_rows], y_train[fit_rows],
+                  eval_set=[(X_train[val_rows], y_train[val_rows])], verbose=False)
+    else:
+        model.fit(X_train, y_train)
+    return model.predict(X_test)
+
+
+def _generate_training_data(driver_teams, driver_skill, teams, circuits, circuit_types, n_samples,
+                            data_version=TRAINING_DATA_VERSION):
+    """
+    Draw `n_samples` synthetic race results from the season metadata (seeded).
+    `data_version` is unused here; it only keys the disk cache.
+    """
+    drivers = list(driver_teams.keys())
+    
+    n = n_samples
+    rng = np.random.default_rng(42)
+    
+    # Per-driver / per-circuit lookup tables; samples index into them
+    driver_team_names = np.array([driver_teams[d] for d in drivers], dtype=object)
+    driver_skill_lut = np.array([driver_skill[d] for d in drivers], dtype=np.int64)
+    team_perf_lut = np.array([teams[driver_teams[d]] for d in drivers], dtype=np.float64)
+    circuit_type_lut = np.array([circuit_types.get(c.lower(), 'mixed') for c in circuits])  # Default to 'mixed' if not found
+    
+    # Random race scenario and driver for every sample, as indices into
+    # the lookup tables (names are only gathered for the final columns)
+    circuit_idx = rng.integers(0, len(circuits), n)
+    driver_idx = rng.integers(0, len(drivers), n)
+    
+    # Team performance (base constructor strength + random variation)
+    team_performance = np.clip(team_perf_lut[driver_idx] + rng.normal(0, 5, n), 0, 100)
+    
+    # Driver skill with circuit specialty
+    def circuit_has(name):
+        return np.array([name in c for c in circuits])[circuit_idx]
+    
+    def driver_in(names):
+        return np.array([d in names for d in drivers])[driver_idx]
+    
+    # Circuit specialists (some drivers perform better on certain tracks);
+    # np.select applies the first matching rule, like an if/elif chain
+    specialist_bonus = np.select([
+        circuit_has('Monaco') & driver_in(['Max Verstappen', 'Charles Leclerc']),
+        (circuit_has('Silverstone') | circuit_has('Spa')) & driver_in(['Lewis Hamilton', 'Max Verstappen']),
+        circuit_has('Singapore') & driver_in(['George Russell', 'Lando Norris']),
+        circuit_has('Suzuka') & driver_in(['Fernando Alonso']),
+    ], [5, 5, 4, 6], 0)
+    skill = driver_skill_lut[driver_idx] + specialist_bonus
+    
+    # Qualifying position (influenced by skill + team + randomness)
+    quali_base = (100 - skill) + (100 - team_performance)
+    quali_position = np.clip(quali_base / 10 + rng.normal(0, 2, n), 1, 20).astype(np.int64)
+    
+    # Weather (affects race outcome)
+    weather_clear = rng.choice([0, 1], n, p=[0.15, 0.85])  # 85% clear weather
+    
+    # Track temperature (affects tire performance)
+    track_temp = rng.uniform(25, 50, n)
+    
+    # Tire strategy (compound choice)
+    tire_strategy = rng.integers(1, 4, n)  # 1=soft, 2=medium, 3=hard
+    
+    # Average speed (km/h) - circuit dependent
+    high_speed = (circuit_type_lut == 'high_speed')[circuit_idx]
+    street = (circuit_type_lut == 'street')[circuit_idx]
+    avg_speed = rng.uniform(np.select([high_speed, street], [220, 160], 190),
+                            np.select([high_speed, street], [245, 190], 220))
+    
+    # Pit stop time (seconds) - random but realistic
+    pit_stop_time = rng.uniform(18, 24, n)
+    
+    # Recent form (simulated last 5 races average position)
+    recent_form = np.clip(rng.normal(quali_position, 3), 1, 20)
+    
+    # Predict race finishing position
+    # Better quali + better skill + better team + luck = better finish
+    position_noise = rng.normal(0, 3, n)
+    
+    # Position prediction formula (realistic F1 patterns)
+    # Midfield/back - more variation
+    finish_position = _midfield_finish(quali_position, position_noise, skill, team_performance)
+    
+    # Pole sitter advantage
+    pole = quali_position == 1
+    finish_position[pole] = np.clip(1 + _draw_offsets(rng, POLE_OFFSETS, POLE_CDF, pole.sum()), 1, 20)
+    
+    # Front row advantage
+    front = (quali_position > 1) & (quali_position <= 3)
+    finish_position[front] = np.clip(
+        quali_position[front] + _draw_offsets(rng, FRONT_OFFSETS, FRONT_CDF, front.sum()), 1, 20)
+    
+    # Apply race incidents (retirements, penalties)
+    dnf = rng.random(n) < 0.12  # 12% DNF rate
+    finish_position[dnf] = rng.integers(16, 21, dnf.sum())
+    
+    # Determine winner (binary)
+    is_winner = (finish_position == 1).astype(np.int64)
+    
+    # Determine podium (binary)
+    is_podium = (finish_position <= 3).astype(np.int64)
+    
+    # Circuit factor (some circuits favor certain characteristics)
+    circuit_factor = rng.uniform(0.8, 1.2, n)
+    
+    data = {
+        'driver': np.array(drivers, dtype=object)[driver_idx],
+        'team': driver_team_names[driver_idx],
+        'circuit': np.array(circuits, dtype=object)[circuit_idx],
+        'qualifying_position': quali_position,
+        'weather_clear': weather_clear,
+        'track_temperature': track_temp,
+        'tire_strategy': tire_strategy,
+        'avg_speed': avg_speed,
+        'pit_stop_time': pit_stop_time,
+        'driver_skill': skill,
+        'team_performance': team_performance,
+        'circuit_factor': circuit_factor,
+        'recent_form': recent_form,
+        'finishing_position': finish_position,
+        'is_winner': is_winner,
+        'is_podium': is_podium
+    }
+    
+    return pd.DataFrame(data)
+
+
+# Same metadata, sample count and generator version always give the same dataset
+_generate_training_data_cached = _memory.cache(_generate_training_data)
+
+# Hyperparameters shared by the classifier and regressor variants
+RF_PARAMS = dict(n_estimators=200, max_depth=15, random_state=42, n_jobs=MODEL_NJOBS)
+XGB_PARAMS = dict(n_estimators=200, max_depth=10, learning_rate=0.1, random_state=42,
+                  n_jobs=MODEL_NJOBS, tree_method='hist', early_stopping_rounds=20)
+HGB_PARAMS = dict(max_iter=200, random_state=42)
+
+
+def _make_models(task, accelerated=False):
+    """
+    Fresh candidate models for a 'classification' or 'regression' target,
+    using the sklearnex estimators where available when `accelerated`
+    """
+    ensemble = dal_ensemble if accelerated else None
+    linear_model = dal_linear_model if accelerated else None
+    if task == 'classification':
+        rf_cls = ensemble.RandomForestClassifier if ensemble else RandomForestClassifier
+        logistic_cls = linear_model.LogisticRegression if linear_model else LogisticRegression
+        return {
+            'random_forest': rf_cls(**RF_PARAMS),
+            'xgboost': xgb.XGBClassifier(**XGB_PARAMS),
+            'hist_gradient_boosting': HistGradientBoostingClassifier(**HGB_PARAMS),
+            'logistic': make_pipeline(StandardScaler(), logistic_cls(max_iter=1000, random_state=42))
+        }
+    rf_cls = ensemble.RandomForestRegressor if ensemble else RandomForestRegressor
+    linear_cls = linear_model.LinearRegression if linear_model else LinearRegression
+    return {
+        'random_forest': rf_cls(**RF_PARAMS),
+        'xgboost': xgb.XGBRegressor(**XGB_PARAMS),
+        'hist_gradient_boosting': HistGradientBoostingRegressor(**HGB_PARAMS),
+        'linear': make_pipeline(StandardScaler(), linear_cls())
+    }
+
+
+def _stock_model(task, name, model, X_train, y_train):
+    """`model` as a stock scikit-learn estimator, refitted if sklearnex fitted it"""
+    if not USE_SKLEARNEX or name not in DAL_MODELS:
+        return model
+    stock = _make_models(task)[name]
+    stock.fit(X_train, y_train)
+    return stock
+
 
 class F1ModelTrainer:
     """Train ML models on F1 historical data"""
@@ -52,29 +311,11 @@ class F1ModelTrainer:
         self.realtime_metadata = data_fetcher.get_all_training_metadata()
         logger.info("Real-time data loaded successfully")
         
-        # Initialize models
-        self.winner_models = {
-            'random_forest': RandomForestClassifier(n_estimators=200, max_depth=15, random_state=42),
-            'xgboost': xgb.XGBClassifier(n_estimators=200, max_depth=10, learning_rate=0.1, random_state=42),
-            'logistic': LogisticRegression(max_iter=1000, random_state=42)
-        }
-        
-        self.podium_models = {
-            'random_forest': RandomForestClassifier(n_estimators=200, max_depth=15, random_state=42),
-            'xgboost': xgb.XGBClassifier(n_estimators=200, max_depth=10, learning_rate=0.1, random_state=42),
-            'logistic': LogisticRegression(max_iter=1000, random_state=42)
-        }
-        
-        self.position_models = {
-            'random_forest': RandomForestRegressor(n_estimators=200, max_depth=15, random_state=42),
-            'xgboost': xgb.XGBRegressor(n_estimators=200, max_depth=10, learning_rate=0.1, random_state=42),
-            'linear': LinearRegression()
-        }
-        
-        self.scaler = StandardScaler()
-        self.driver_encoder = LabelEncoder()
-        self.team_encoder = LabelEncoder()
-        self.circuit_encoder = LabelEncoder()
+        # Category tables for the label columns (sorted labels, numbered
+        # like LabelEncoder would); set when features are first prepared
+        self.driver_categories = None
+        self.team_categories = None
+        self.circuit_categories = None
         
         self.timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
@@ -98,133 +339,45 @@ class F1ModelTrainer:
         logger.info(f"Loaded {len(set(driver_teams.values()))} teams")
         logger.info(f"Loaded {len(circuits)} circuits")
         
-        data = []
-        
-        for _ in range(n_samples):
-            # Random race scenario
-            circuit = np.random.choice(circuits)
-            circuit_type = circuit_types.get(circuit, 'mixed')  # Default to 'mixed' if not found
-            
-            # Random driver
-            driver = np.random.choice(drivers)
-            team = driver_teams[driver]
-            
-            # Team performance (base constructor strength + random variation)
-            team_performance = teams[team] + np.random.normal(0, 5)
-            team_performance = np.clip(team_performance, 0, 100)
-            
-            # Driver skill with circuit specialty
-            skill = driver_skill[driver]
-            
-            # Circuit specialists (some drivers perform better on certain tracks)
-            if 'Monaco' in circuit and driver in ['Max Verstappen', 'Charles Leclerc']:
-                skill += 5
-            elif ('Silverstone' in circuit or 'Spa' in circuit) and driver in ['Lewis Hamilton', 'Max Verstappen']:
-                skill += 5
-            elif 'Singapore' in circuit and driver in ['George Russell', 'Lando Norris']:
-                skill += 4
-            elif 'Suzuka' in circuit and driver == 'Fernando Alonso':
-                skill += 6
-            
-            # Qualifying position (influenced by skill + team + randomness)
-            quali_base = (100 - skill) + (100 - team_performance)
-            quali_position = int(np.clip(quali_base / 10 + np.random.normal(0, 2), 1, 20))
-            
-            # Weather (affects race outcome)
-            weather_clear = np.random.choice([0, 1], p=[0.15, 0.85])  # 85% clear weather
-            
-            # Track temperature (affects tire performance)
-            track_temp = np.random.uniform(25, 50)
-            
-            # Tire strategy (compound choice)
-            tire_strategy = np.random.choice([1, 2, 3])  # 1=soft, 2=medium, 3=hard
-            
-            # Average speed (km/h) - circuit dependent
-            if circuit_type == 'high_speed':
-                avg_speed = np.random.uniform(220, 245)
-            elif circuit_type == 'street':
-                avg_speed = np.random.uniform(160, 190)
-            else:
-                avg_speed = np.random.uniform(190, 220)
-            
-            # Pit stop time (seconds) - random but realistic
-            pit_stop_time = np.random.uniform(18, 24)
-            
-            # Recent form (simulated last 5 races average position)
-            recent_form = np.random.normal(quali_position, 3)
-            recent_form = np.clip(recent_form, 1, 20)
-            
-            # Predict race finishing position
-            # Better quali + better skill + better team + luck = better finish
-            position_noise = np.random.normal(0, 3)
-            
-            # Position prediction formula (realistic F1 patterns)
-            if quali_position == 1:
-                # Pole sitter advantage
-                finish_position = np.clip(1 + np.random.choice([0, 0, 1, 2], p=[0.5, 0.3, 0.15, 0.05]), 1, 20)
-            elif quali_position <= 3:
-                # Front row advantage
-                finish_position = np.clip(quali_position + np.random.choice([-1, 0, 1, 2], p=[0.2, 0.4, 0.3, 0.1]), 1, 20)
-            else:
-                # Midfield/back - more variation
-                skill_factor = (skill - 70) / 10  # -3 to +2.8
-                team_factor = (team_performance - 50) / 20  # -2.5 to +2.5
-                
-                finish_position = quali_position + position_noise - skill_factor - team_factor
-                finish_position = int(np.clip(finish_position, 1, 20))
-            
-            # Apply race incidents (retirements, penalties)
-            if np.random.random() < 0.12:  # 12% DNF rate
-                finish_position = np.random.randint(16, 21)
-            
-            # Determine winner (binary)
-            is_winner = 1 if finish_position == 1 else 0
-            
-            # Determine podium (binary)
-            is_podium = 1 if finish_position <= 3 else 0
-            
-            # Circuit factor (some circuits favor certain characteristics)
-            circuit_factor = np.random.uniform(0.8, 1.2)
-            
-            data.append({
-                'driver': driver,
-                'team': team,
-                'circuit': circuit,
-                'qualifying_position': quali_position,
-                'weather_clear': weather_clear,
-                'track_temperature': track_temp,
-                'tire_strategy': tire_strategy,
-                'avg_speed': avg_speed,
-                'pit_stop_time': pit_stop_time,
-                'driver_skill': skill,
-                'team_performance': team_performance,
-                'circuit_factor': circuit_factor,
-                'recent_form': recent_form,
-                'finishing_position': int(finish_position),
-                'is_winner': is_winner,
-                'is_podium': is_podium
-            })
-        
-        df = pd.DataFrame(data)
+        # Plain dicts: the cache key is built by pickling the arguments,
+        # and the shared read-only tables can't be pickled
+        df = _generate_training_data_cached(dict(driver_teams), dict(driver_skill), dict(teams),
+                                            circuits, dict(circuit_types), n_samples,
+                                            data_version=TRAINING_DATA_VERSION)
         logger.info(f"Generated {len(df)} training samples")
         logger.info(f"Winner distribution: {df['is_winner'].sum()} wins out of {len(df)} races")
         logger.info(f"Podium distribution: {df['is_podium'].sum()} podiums out of {len(df)} races")
         
         return df
     
+    def save_training_data(self, df, csv=False):
+        """
+        Dump the training set to the models directory as zstd-compressed
+        Parquet, or as CSV when asked for (human inspection) or when
+        pyarrow is not installed. Returns the written path.
+        """
+        if pyarrow is not None and not csv:
+            path = f'{self.models_dir}/training_data_{self.timestamp}.parquet'
+            df.to_parquet(path, engine='pyarrow', compression='zstd', index=False)
+        else:
+            path = f'{self.models_dir}/training_data_{self.timestamp}.csv'
+            df.to_csv(path, index=False)
+        return path
+    
     def prepare_features(self, df, fit_encoders=True):
         """Prepare features for training"""
         logger.info("Preparing features...")
         
-        # Encode categorical variables
+        # Encode categorical variables (hash lookup into the category
+        # tables; labels missing from a table get code -1)
         if fit_encoders:
-            df['driver_encoded'] = self.driver_encoder.fit_transform(df['driver'])
-            df['team_encoded'] = self.team_encoder.fit_transform(df['team'])
-            df['circuit_encoded'] = self.circuit_encoder.fit_transform(df['circuit'])
-        else:
-            df['driver_encoded'] = self.driver_encoder.transform(df['driver'])
-            df['team_encoded'] = self.team_encoder.transform(df['team'])
-            df['circuit_encoded'] = self.circuit_encoder.transform(df['circuit'])
+            self.driver_categories = pd.CategoricalDtype(sorted(df['driver'].unique()))
+            self.team_categories = pd.CategoricalDtype(sorted(df['team'].unique()))
+            self.circuit_categories = pd.CategoricalDtype(sorted(df['circuit'].unique()))
+        
+        df['driver_encoded'] = df['driver'].astype(self.driver_categories).cat.codes
+        df['team_encoded'] = df['team'].astype(self.team_categories).cat.codes
+        df['circuit_encoded'] = df['circuit'].astype(self.circuit_categories).cat.codes
         
         # Feature columns
         feature_cols = [
@@ -248,8 +401,8 @@ class F1ModelTrainer:
         df = self.generate_training_data(n_samples=5000)
         
         # Save training data for reference
-        df.to_csv(f'{self.models_dir}/training_data_{self.timestamp}.csv', index=False)
-        logger.info(f"Training data saved to training_data_{self.timestamp}.csv")
+        data_path = self.save_training_data(df)
+        logger.info(f"Training data saved to {os.path.basename(data_path)}")
         
         # Prepare features
         X, feature_cols = self.prepare_features(df, fit_encoders=True)
@@ -259,20 +412,20 @@ class F1ModelTrainer:
         y_podium = df['is_podium']
         y_position = df['finishing_position']
         
-        # Split data
-        X_train, X_test, y_winner_train, y_winner_test = train_test_split(
-            X, y_winner, test_size=0.2, random_state=42, stratify=y_winner
-        )
-        _, _, y_podium_train, y_podium_test = train_test_split(
-            X, y_podium, test_size=0.2, random_state=42, stratify=y_podium
-        )
-        _, _, y_position_train, y_position_test = train_test_split(
-            X, y_position, test_size=0.2, random_state=42
+        # Split data once so every target sees the same rows; stratify on
+        # winner + podium (0 = off the podium, 1 = podium, 2 = win)
+        (X_train, X_test,
+         y_winner_train, y_winner_test,
+         y_podium_train, y_podium_test,
+         y_position_train, y_position_test) = train_test_split(
+            X, y_winner, y_podium, y_position,
+            test_size=0.2, random_state=42, stratify=y_winner + y_podium
         )
         
-        # Scale features
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        X_test_scaled = self.scaler.transform(X_test)
+        # Only the linear models standardize their inputs (inside their
+        # pipelines); the tree models split on the raw feature values
+        X_train = X_train.to_numpy(dtype=np.float64)
+        X_test = X_test.to_numpy(dtype=np.float64)
         
         results = {
             'timestamp': self.timestamp,
@@ -282,6 +435,26 @@ class F1ModelTrainer:
             'models': {}
         }
         
+        # Fresh candidate models per target
+        winner_models = _make_models('classification', accelerated=USE_SKLEARNEX)
+        podium_models = _make_models('classification', accelerated=USE_SKLEARNEX)
+        position_models = _make_models('regression', accelerated=USE_SKLEARNEX)
+        
+        # Fit every candidate model up front, PARALLEL_FITS at a time
+        tasks = [
+            (target, name, model, y_train)
+            for target, models, y_train in (('winner', winner_models, y_winner_train),
+                                            ('podium', podium_models, y_podium_train),
+                                            ('position', position_models, y_position_train))
+            for name, model in models.items()
+        ]
+        logger.info(f"Fitting {len(tasks)} models ({PARALLEL_FITS} at a time)...")
+        predictions = Parallel(n_jobs=PARALLEL_FITS, prefer='threads')(
+            delayed(_fit_predict)(model, X_train, y_train, X_test)
+            for _, _, model, y_train in tasks
+        )
+        test_predictions = {(target, name): y_pred for (target, name, _, _), y_pred in zip(tasks, predictions)}
+        
         # Train Winner Prediction Models
         logger.info("\n" + "=" * 60)
         logger.info("TRAINING WINNER PREDICTION MODELS")
@@ -290,11 +463,10 @@ class F1ModelTrainer:
         best_winner_model = None
         best_winner_score = 0
         
-        for name, model in self.winner_models.items():
-            logger.info(f"\nTraining {name} for winner prediction...")
+        for name, model in winner_models.items():
+            logger.info(f"\nEvaluating {name} for winner prediction...")
             
-            model.fit(X_train_scaled, y_winner_train)
-            y_pred = model.predict(X_test_scaled)
+            y_pred = test_predictions[('winner', name)]
             
             accuracy = accuracy_score(y_winner_test, y_pred)
             precision = precision_score(y_winner_test, y_pred, zero_division=0)
@@ -325,11 +497,10 @@ class F1ModelTrainer:
         best_podium_model = None
         best_podium_score = 0
         
-        for name, model in self.podium_models.items():
-            logger.info(f"\nTraining {name} for podium prediction...")
+        for name, model in podium_models.items():
+            logger.info(f"\nEvaluating {name} for podium prediction...")
             
-            model.fit(X_train_scaled, y_podium_train)
-            y_pred = model.predict(X_test_scaled)
+            y_pred = test_predictions[('podium', name)]
             
             accuracy = accuracy_score(y_podium_test, y_pred)
             precision = precision_score(y_podium_test, y_pred, zero_division=0)
@@ -360,11 +531,10 @@ class F1ModelTrainer:
         best_position_model = None
         best_position_score = float('inf')
         
-        for name, model in self.position_models.items():
-            logger.info(f"\nTraining {name} for position prediction...")
+        for name, model in position_models.items():
+            logger.info(f"\nEvaluating {name} for position prediction...")
             
-            model.fit(X_train_scaled, y_position_train)
-            y_pred = model.predict(X_test_scaled)
+            y_pred = test_predictions[('position', name)]
             
             mae = mean_absolute_error(y_position_test, y_pred)
             
@@ -378,40 +548,50 @@ class F1ModelTrainer:
                 best_position_score = mae
                 best_position_model = (name, model)
         
+        # Boosting rounds kept by XGBoost's early stopping
+        for target, models in (('winner', winner_models), ('podium', podium_models),
+                               ('position', position_models)):
+            results['models'][f'{target}_xgboost']['best_iteration'] = models['xgboost'].best_iteration
+        
         # Save best models
         logger.info("\n" + "=" * 60)
         logger.info("SAVING BEST MODELS")
         logger.info("=" * 60)
         
+        # Pickles of sklearnex estimators need sklearnex to load, which
+        # the server doesn't install
+        best_winner_model = (best_winner_model[0], _stock_model(
+            'classification', *best_winner_model, X_train, y_winner_train))
+        best_podium_model = (best_podium_model[0], _stock_model(
+            'classification', *best_podium_model, X_train, y_podium_train))
+        best_position_model = (best_position_model[0], _stock_model(
+            'regression', *best_position_model, X_train, y_position_train))
+        
         # Save winner model
         winner_path = f'{self.models_dir}/winner_model_{self.timestamp}.pkl'
-        joblib.dump(best_winner_model[1], winner_path)
+        joblib.dump(best_winner_model[1], winner_path, compress=MODEL_COMPRESSION)
         logger.info(f"✓ Saved best winner model ({best_winner_model[0]}): {winner_path}")
         logger.info(f"  Accuracy: {best_winner_score:.4f}")
         
         # Save podium model
         podium_path = f'{self.models_dir}/podium_model_{self.timestamp}.pkl'
-        joblib.dump(best_podium_model[1], podium_path)
+        joblib.dump(best_podium_model[1], podium_path, compress=MODEL_COMPRESSION)
         logger.info(f"✓ Saved best podium model ({best_podium_model[0]}): {podium_path}")
         logger.info(f"  Accuracy: {best_podium_score:.4f}")
         
         # Save position model
         position_path = f'{self.models_dir}/position_model_{self.timestamp}.pkl'
-        joblib.dump(best_position_model[1], position_path)
+        joblib.dump(best_position_model[1], position_path, compress=MODEL_COMPRESSION)
         logger.info(f"✓ Saved best position model ({best_position_model[0]}): {position_path}")
         logger.info(f"  MAE: {best_position_score:.4f}")
         
-        # Save scaler and encoders
-        scaler_path = f'{self.models_dir}/scaler_{self.timestamp}.pkl'
-        joblib.dump(self.scaler, scaler_path)
-        logger.info(f"✓ Saved scaler: {scaler_path}")
-        
+        # Save encoders
         encoders_path = f'{self.models_dir}/encoders_{self.timestamp}.pkl'
         joblib.dump({
-            'driver': self.driver_encoder,
-            'team': self.team_encoder,
-            'circuit': self.circuit_encoder
-        }, encoders_path)
+            'driver': self.driver_categories,
+            'team': self.team_categories,
+            'circuit': self.circuit_categories
+        }, encoders_path, compress=MODEL_COMPRESSION)
         logger.info(f"✓ Saved encoders: {encoders_path}")
         
         # Save metadata
@@ -434,13 +614,16 @@ class F1ModelTrainer:
         }
         
         results['files'] = {
-            'scaler': scaler_path,
             'encoders': encoders_path
         }
         
         metadata_path = f'{self.models_dir}/ml_metadata_{self.timestamp}.json'
-        with open(metadata_path, 'w') as f:
-            json.dump(results, f, indent=2)
+        if orjson is not None:
+            with open(metadata_path, 'wb') as f:
+                f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(metadata_path, 'w') as f:
+                json.dump(results, f, indent=2)
         logger.info(f"✓ Saved metadata: {metadata_path}")
         
         logger.info("\n" + "=" * 60)